@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+SPRINT3 KERNEL AOT BUILD
+========================
+Ahead-of-time compiles the sprint3 scoring kernel into a native extension
+module (sprint3_kernel) so the bot skips numba JIT warm-up on every start.
+
+sprint3_strategy imports the compiled module when present and falls back
+to the JIT (or pure Python) kernel otherwise. Rebuild after changing
+_score_kernel.
+
+Usage:
+  python build_sprint3_kernel.py
+"""
+
+import os
+import sys
+
+
+def main():
+    try:
+        from numba.pycc import CC
+    except ImportError:
+        print("numba is not installed - nothing to build (pure Python kernel will be used)")
+        return 1
+
+    from sprint3_strategy import _score_kernel, SCORE_KERNEL_SIGNATURE
+
+    cc = CC('sprint3_kernel')
+    cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+    cc.export('score_kernel', SCORE_KERNEL_SIGNATURE)(
+        getattr(_score_kernel, 'py_func', _score_kernel)
+    )
+    cc.compile()
+
+    print(f"Built sprint3_kernel in {cc.output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
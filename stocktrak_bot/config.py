@@ -12,6 +12,7 @@ Fallback values are provided for development only.
 
 import os
 from datetime import datetime
+from functools import lru_cache
 
 # =============================================================================
 # SPRINT MODE FLAG - Enable for final week aggressive trading
@@ -311,8 +312,9 @@ def get_all_tickers():
     """Get all tickers we need to monitor"""
     return list(CORE_POSITIONS.keys()) + get_all_satellite_tickers()
 
+@lru_cache(maxsize=None)
 def get_bucket_for_ticker(ticker):
-    """Find which bucket a ticker belongs to"""
+    """Find which bucket a ticker belongs to (buckets are static - memoized)"""
     for bucket_name, bucket_tickers in SATELLITE_BUCKETS.items():
         if ticker in bucket_tickers:
             return bucket_name
@@ -251,10 +251,10 @@ def _execute_daily_routine_inner(state: StateManager) -> 'StockTrakBot':
 
     logger.info(f"Capital: Portfolio=${portfolio_value:,.2f}, Cash=${cash_balance:,.2f}, Buying Power=${buying_power:,.2f}")
 
-    # Get other StockTrak data
+    # Get other StockTrak data (trade count first: the KPI page is still loaded)
     logger.info("Fetching holdings and trade count...")
+    trade_count = bot.get_transaction_count(reload=False)
     stocktrak_holdings = bot.get_current_holdings()
-    trade_count = bot.get_transaction_count()
 
     # Sync state with StockTrak
     sync_state_with_stocktrak(state, stocktrak_holdings, trade_count)
@@ -415,7 +415,9 @@ class ExecutionPipeline:
             self.current_state = TradeState.COMPLETED
             self._update_dashboard("IDLE", "COMPLETED", order)
 
-            # Log to state manager
+            # Log to state manager. log_trade numbers the entry from the
+            # current count, so it must run before the increment (which
+            # writes state through immediately for compliance).
             self.state_manager.log_trade(
                 ticker=order.ticker,
                 action=order.side,
@@ -361,9 +361,10 @@ def sprint3_mode(dry_run: bool = False, force_day: int = None):
     """
     from sprint3_strategy import (
         Sprint3Executor, plan_sprint3, print_sprint3_plan, print_sprint3_scoring_report,
-        is_market_open, is_in_execution_window, SPRINT3_SATELLITE_UNIVERSE, SPRINT3_CORE
+        is_market_open, is_in_execution_window, SPRINT3_FULL_UNIVERSE
     )
     from market_data import MarketDataCollector
+    from utils import get_current_time_et
     from stocktrak_bot import StockTrakBot
     from state_manager import StateManager
 
@@ -375,9 +376,10 @@ def sprint3_mode(dry_run: bool = False, force_day: int = None):
 
     state = StateManager()
 
-    # Check market status
-    market_open, market_reason = is_market_open()
-    in_window, window_reason = is_in_execution_window()
+    # Check market status (one timestamp for both gates)
+    now = get_current_time_et()
+    market_open, market_reason = is_market_open(now)
+    in_window, window_reason = is_in_execution_window(now)
 
     print(f"\nMarket: {market_reason}")
     print(f"Execution Window: {window_reason}")
@@ -401,8 +403,7 @@ def sprint3_mode(dry_run: bool = False, force_day: int = None):
 
         # Fetch market data
         collector = MarketDataCollector()
-        all_tickers = list(SPRINT3_CORE.keys()) + SPRINT3_SATELLITE_UNIVERSE
-        market_data = collector.get_all_data(all_tickers)
+        market_data = collector.get_all_data(SPRINT3_FULL_UNIVERSE)
 
         # Print scoring report
         print_sprint3_scoring_report(market_data)
@@ -481,6 +482,7 @@ def sprint3_status_mode():
     """Show current SPRINT3 status."""
     from sprint3_strategy import is_market_open, is_in_execution_window
     from state_manager import StateManager
+    from utils import get_current_time_et
 
     state = StateManager()
     sprint3 = state.get_sprint3_state()
@@ -505,9 +507,10 @@ def sprint3_status_mode():
     print(f"Total Trades Used: {state.get_trades_used()}/80")
     print(f"Total Remaining:   {state.get_trades_remaining()}")
 
-    # Market status
-    market_open, market_reason = is_market_open()
-    in_window, window_reason = is_in_execution_window()
+    # Market status (one timestamp for both gates)
+    now = get_current_time_et()
+    market_open, market_reason = is_market_open(now)
+    in_window, window_reason = is_in_execution_window(now)
 
     print("-" * 70)
     print(f"Market:            {market_reason}")
@@ -722,10 +725,10 @@ def hold_test_mode():
         # Create position manually for precise control
         state.state['positions'][ticker] = {
             'ticker': ticker,
-            'lots': [
-                {'lot_id': 'LOT1', 'qty': 100, 'buy_ts_utc': lot1_ts, 'buy_price': 50.00},
-                {'lot_id': 'LOT2', 'qty': 50, 'buy_ts_utc': lot2_ts, 'buy_price': 51.00},
-            ],
+            'lots': {
+                'LOT1': {'lot_id': 'LOT1', 'qty': 100, 'buy_ts_utc': lot1_ts, 'buy_price': 50.00},
+                'LOT2': {'lot_id': 'LOT2', 'qty': 50, 'buy_ts_utc': lot2_ts, 'buy_price': 51.00},
+            },
             'shares': 150,
             'entry_price': 50.33,
             'entry_date': now.date().isoformat(),
@@ -909,7 +912,9 @@ def hold_test_mode():
         return 1
 
     finally:
-        # Cleanup temp file
+        # Cleanup temp file (flush first so no pending write recreates it)
+        if 'state' in locals():
+            state.flush()
         if os.path.exists(test_state_file):
             os.remove(test_state_file)
         backup = test_state_file.replace('.json', '_backup.json')
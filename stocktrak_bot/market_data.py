@@ -5,11 +5,13 @@ Uses yfinance to fetch real-time and historical market data
 for all tickers in the portfolio and candidate lists.
 """
 
+import asyncio
 import logging
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import time
 
+import numpy as np
 import yfinance as yf
 import pandas as pd
 
@@ -26,12 +28,25 @@ class MarketDataCollector:
     def __init__(self):
         self.cache = {}
         self.cache_timestamp = None
-        self.cache_duration = timedelta(minutes=5)
+        self.cache_duration = timedelta(seconds=60)
 
     def get_all_tickers(self) -> List[str]:
         """Get list of all tickers to monitor"""
         return get_all_tickers()
 
+    def _get_cached(self, tickers: List[str]) -> Optional[Dict]:
+        """Return a fetch result for the same ticker set if still fresh."""
+        entry = self.cache.get(frozenset(tickers))
+        if entry and datetime.now() - entry[0] < self.cache_duration:
+            logger.info(f"Using cached market data for {len(tickers)} tickers")
+            return entry[1]
+        return None
+
+    def _store_cached(self, tickers: List[str], data: Dict):
+        """Remember a complete fetch result (aborted fetches are not cached)."""
+        self.cache_timestamp = datetime.now()
+        self.cache[frozenset(tickers)] = (self.cache_timestamp, data)
+
     def get_all_data(self, tickers: List[str] = None,
                        max_consecutive_failures: int = 5,
                        max_total_failures_pct: float = 0.5) -> Dict:
@@ -49,7 +64,12 @@ class MarketDataCollector:
         if tickers is None:
             tickers = self.get_all_tickers()
 
+        cached = self._get_cached(tickers)
+        if cached is not None:
+            return cached
+
         data = {}
+        aborted = False
         logger.info(f"Fetching market data for {len(tickers)} tickers...")
 
         # Get VIX first - CRITICAL: return None if unavailable, don't default
@@ -66,6 +86,7 @@ class MarketDataCollector:
             # Circuit breaker: too many consecutive failures
             if consecutive_failures >= max_consecutive_failures:
                 logger.critical(f"CIRCUIT BREAKER: {consecutive_failures} consecutive failures - aborting fetch")
+                aborted = True
                 break
 
             try:
@@ -88,14 +109,101 @@ class MarketDataCollector:
             total_attempted = success_count + fail_count
             if total_attempted >= 5 and fail_count / total_attempted > max_total_failures_pct:
                 logger.critical(f"CIRCUIT BREAKER: {fail_count}/{total_attempted} failures exceeds threshold - aborting")
+                aborted = True
                 break
 
             # Rate limiting - be gentle with yfinance
             time.sleep(0.1)
 
         logger.info(f"Fetched data for {success_count} tickers, {fail_count} failed")
+        if not aborted:
+            self._store_cached(tickers, data)
+        return data
+
+    async def get_all_data_async(self, tickers: List[str] = None,
+                                 max_concurrency: int = 8,
+                                 max_total_failures_pct: float = 0.5) -> Dict:
+        """
+        Fetch all required market data concurrently.
+
+        yfinance is blocking, so each ticker is fetched in a worker thread;
+        a semaphore bounds the number of in-flight requests to Yahoo.
+
+        Args:
+            tickers: List of tickers to fetch (defaults to all)
+            max_concurrency: Maximum concurrent ticker fetches
+            max_total_failures_pct: Stop issuing new fetches once this
+                percentage of attempted tickers has failed
+
+        Returns:
+            Dict with ticker data and VIX (same shape as get_all_data)
+        """
+        if tickers is None:
+            tickers = self.get_all_tickers()
+
+        cached = self._get_cached(tickers)
+        if cached is not None:
+            return cached
+
+        logger.info(f"Fetching market data for {len(tickers)} tickers (concurrency {max_concurrency})...")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        counts = {'success': 0, 'fail': 0}
+
+        async def fetch(ticker: str) -> Optional[Dict]:
+            async with semaphore:
+                # Circuit breaker: skip remaining tickers once failure rate is too high
+                attempted = counts['success'] + counts['fail']
+                if attempted >= 5 and counts['fail'] / attempted > max_total_failures_pct:
+                    return None
+
+                try:
+                    ticker_data = await asyncio.to_thread(self._get_ticker_data, ticker)
+                except Exception as e:
+                    logger.error(f"Failed to get data for {ticker}: {e}")
+                    ticker_data = None
+
+                counts['success' if ticker_data else 'fail'] += 1
+                return ticker_data
+
+        vix, *results = await asyncio.gather(
+            asyncio.to_thread(self._get_vix),
+            *(fetch(t) for t in tickers)
+        )
+
+        # VIX first - CRITICAL: None if unavailable, don't default
+        data = {'vix': vix}
+        if vix is None:
+            logger.critical("VIX data unavailable - this is critical for regime detection")
+        data.update(zip(tickers, results))
+
+        attempted = counts['success'] + counts['fail']
+        if attempted < len(tickers):
+            logger.critical(f"CIRCUIT BREAKER: {counts['fail']}/{attempted} failures exceeds threshold - "
+                            f"skipped {len(tickers) - attempted} tickers")
+        else:
+            self._store_cached(tickers, data)
+
+        logger.info(f"Fetched data for {counts['success']} tickers, {counts['fail']} failed")
         return data
 
+    def get_all_data_concurrent(self, tickers: List[str] = None, **kwargs) -> Dict:
+        """
+        Blocking wrapper around get_all_data_async for synchronous callers.
+
+        Runs in a helper thread if an event loop is already running in this
+        thread (e.g. under the Playwright sync API).
+        """
+        coro = self.get_all_data_async(tickers, **kwargs)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, coro).result()
+
     def _get_vix(self) -> Optional[float]:
         """
         Get current VIX level.
@@ -325,6 +433,76 @@ class MarketDataCollector:
         return True
 
 
+class MarketDataTable:
+    """
+    Columnar (structure-of-arrays) view of a get_all_data() result.
+
+    Numeric fields are stored as contiguous float64 arrays aligned with
+    `tickers`, so scoring can run over whole columns instead of probing
+    one dict per ticker. Missing or None values are NaN.
+    """
+
+    NUMERIC_FIELDS = (
+        'price', 'sma20', 'sma50',
+        'return_1d', 'return_3d', 'return_10d', 'return_21d',
+        'vol10', 'volatility_21d',
+    )
+
+    def __init__(self, tickers: List[str], columns: Dict[str, np.ndarray], rows: List[Dict]):
+        self.tickers = np.array(tickers, dtype=object)
+        self.columns = columns
+        self.index = {t: i for i, t in enumerate(tickers)}
+        self._rows = rows
+
+    @classmethod
+    def from_market_data(cls, data: Dict, tickers: List[str] = None) -> 'MarketDataTable':
+        """
+        Build a table from a market data dict.
+
+        Args:
+            data: Market data dict from get_all_data()
+            tickers: Tickers to include, in order (defaults to all ticker keys).
+                Tickers without data are skipped.
+        """
+        if tickers is None:
+            tickers = [t for t in data if t != 'vix']
+
+        present = []
+        rows = []
+        for ticker in tickers:
+            ticker_data = data.get(ticker)
+            if ticker_data:
+                present.append(ticker)
+                rows.append(ticker_data)
+            else:
+                logger.debug("No data for %s", ticker)
+
+        nan = float('nan')
+        columns = {
+            field: np.fromiter(
+                (nan if (v := row.get(field)) is None else v for row in rows),
+                dtype=np.float64, count=len(rows)
+            )
+            for field in cls.NUMERIC_FIELDS
+        }
+        return cls(present, columns, rows)
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self.index
+
+    def column(self, field: str) -> np.ndarray:
+        """Float64 column for a numeric field."""
+        return self.columns[field]
+
+    def row(self, ticker: str) -> Dict:
+        """Original per-ticker data dict (empty if the ticker has no data)."""
+        i = self.index.get(ticker)
+        return self._rows[i] if i is not None else {}
+
+
 def print_market_summary(data: Dict):
     """
     Print a summary of current market conditions.
@@ -112,10 +112,10 @@ class QueueManager:
         try:
             # Navigate to Order History
             self.bot.page.goto(STOCKTRAK_ORDER_HISTORY_URL, timeout=30000)
-            self.bot.page.wait_for_load_state("networkidle")
+            from stocktrak_bot import dismiss_stocktrak_overlays, wait_for_table_rows
+            wait_for_table_rows(self.bot.page)
 
             # Dismiss any overlays
-            from stocktrak_bot import dismiss_stocktrak_overlays
             dismiss_stocktrak_overlays(self.bot.page, total_ms=5000)
 
             time.sleep(1)
@@ -378,9 +378,9 @@ class QueueManager:
             # Navigate to Order History if not already there
             if 'orderhistory' not in self.bot.page.url.lower():
                 self.bot.page.goto(STOCKTRAK_ORDER_HISTORY_URL, timeout=30000)
-                self.bot.page.wait_for_load_state("networkidle")
+                from stocktrak_bot import dismiss_stocktrak_overlays, wait_for_table_rows
+                wait_for_table_rows(self.bot.page)
 
-                from stocktrak_bot import dismiss_stocktrak_overlays
                 dismiss_stocktrak_overlays(self.bot.page, total_ms=3000)
                 time.sleep(1)
 
@@ -417,7 +417,9 @@ class QueueManager:
 
                         # Verify cancellation
                         self.bot.page.reload()
-                        self.bot.page.wait_for_load_state("networkidle")
+                        from stocktrak_bot import wait_for_table_rows
+                        # Short wait: the cancelled order may have been the only row
+                        wait_for_table_rows(self.bot.page, timeout_ms=5000)
                         time.sleep(1)
 
                         # Check if order is gone or status changed to cancelled
@@ -21,17 +21,36 @@ Competition Constraints Enforced:
 """
 
 import logging
+import sys
 import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from functools import lru_cache
+from heapq import merge
+from operator import attrgetter
+from datetime import datetime, timedelta, time as dt_time
+from typing import Dict, Iterable, List, Tuple, Optional
 from dataclasses import dataclass
+import numpy as np
 import pytz
 
+try:
+    from numba import njit, prange
+    _HAVE_NUMBA = True
+except ImportError:  # numba is optional - fall back to plain Python
+    _HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+    prange = range
+
 from config import CORE_POSITIONS, get_bucket_for_ticker
 from state_manager import StateManager
-from market_data import MarketDataCollector
+from execution_pipeline import ExecutionPipeline, TradeOrder
+from market_data import MarketDataCollector, MarketDataTable
 from validators import is_prohibited
-from utils import calculate_limit_price, calculate_shares_for_allocation, get_current_time_et
+from utils import calculate_limit_price, calculate_shares_for_allocation, get_current_time_et, TokenBucket
 
 logger = logging.getLogger('stocktrak_bot.sprint3')
 
@@ -58,6 +77,10 @@ SPRINT3_BUFFER_TRADES = 5
 SPRINT3_MIN_PRICE = 6.00  # Only buy if price >= $6
 SPRINT3_LIMIT_FLOOR = 5.01  # Limit price cannot be below $5.01
 
+# Order pacing (token bucket - replaces a fixed 3s sleep after every trade)
+SPRINT3_ORDER_RATE_PER_SEC = 1 / 3  # Sustained: one order per 3 seconds
+SPRINT3_ORDER_BURST = 1
+
 # Holding period (24h + buffer in seconds)
 SPRINT3_HOLD_BUFFER_SECONDS = 120  # 2 minute buffer on top of 24h
 
@@ -66,6 +89,26 @@ SPRINT3_HOLD_BUFFER_SECONDS = 120  # 2 minute buffer on top of 24h
 SPRINT3_EXECUTION_WINDOW_START = "09:40"  # 9:40 AM ET
 SPRINT3_EXECUTION_WINDOW_END = "10:05"    # 10:05 AM ET
 
+# ForecastScore weights: score = 0.55*rr3 + 0.35*rr10 - 0.25*vol10
+# (module constants - compile-time immediates for the numba kernel)
+_W_RR3 = 0.55
+_W_RR10 = 0.35
+_W_VOL10 = 0.25
+
+# Fallback scaling of 21-day return to shorter horizons, default volatility
+_R1_21 = 1 / 21
+_R3_21 = 3 / 21
+_R10_21 = 10 / 21
+_DEFAULT_VOL = 0.05
+
+# Precomputed once at import (avoid per-call tz lookups and string parsing)
+_ET = pytz.timezone('US/Eastern')
+_WINDOW_START_TIME = datetime.strptime(SPRINT3_EXECUTION_WINDOW_START, "%H:%M").time()
+_WINDOW_END_TIME = datetime.strptime(SPRINT3_EXECUTION_WINDOW_END, "%H:%M").time()
+_MARKET_OPEN_T = dt_time(9, 30)
+_MARKET_CLOSE_T = dt_time(16, 0)
+_MIN_HOLD_DELTA = timedelta(hours=24, seconds=SPRINT3_HOLD_BUFFER_SECONDS)
+
 # =============================================================================
 # SATELLITE UNIVERSE (curated, liquid, non-leveraged)
 # =============================================================================
@@ -107,14 +150,40 @@ SPRINT3_SATELLITE_STOCKS = [
 # Combined universe
 SPRINT3_SATELLITE_UNIVERSE = SPRINT3_SATELLITE_ETFS + SPRINT3_SATELLITE_STOCKS
 
+# Everything a sprint day fetches (core first), and O(1) core membership
+SPRINT3_FULL_UNIVERSE = tuple(SPRINT3_CORE) + tuple(SPRINT3_SATELLITE_UNIVERSE)
+SPRINT3_CORE_SET = frozenset(SPRINT3_CORE)
+
+# O(1) ETF membership (lists above keep their order for universe iteration)
+_SATELLITE_ETF_SET = frozenset(SPRINT3_SATELLITE_ETFS)
+
+_by_score = attrgetter('score')
+
+# Prohibited-list lookups are static per ticker - memoize across scoring passes
+_is_prohibited = lru_cache(maxsize=4096)(is_prohibited)
+
+# Universe position per ticker, and prohibited flag per position
+# (for the vectorized eligibility mask)
+_UNIVERSE_INDEX = {t: i for i, t in enumerate(SPRINT3_SATELLITE_UNIVERSE)}
+_PROHIBITED_MASK = np.array([_is_prohibited(t) for t in SPRINT3_SATELLITE_UNIVERSE], dtype=bool)
+
+
+def clear_caches():
+    """Clear memoized lookups (call after reloading universe/prohibited config)."""
+    global _PROHIBITED_MASK
+    _is_prohibited.cache_clear()
+    _parse_buy_time.cache_clear()
+    clear_sprint3_cache()
+    _PROHIBITED_MASK = np.array([_is_prohibited(t) for t in SPRINT3_SATELLITE_UNIVERSE], dtype=bool)
+
 
 # =============================================================================
 # SCORING / FORECASTING
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class Sprint3Candidate:
-    """Scored satellite candidate for sprint3."""
+    """Scored satellite candidate for sprint3 (slotted: created per ticker per scoring pass)."""
     ticker: str
     score: float
     r1: float      # 1-day return
@@ -129,83 +198,90 @@ class Sprint3Candidate:
     trend_ok: bool
     is_eligible: bool
     disqualify_reason: Optional[str] = None
+    is_etf: bool = False  # Set once at scoring time (read in hot filter loops)
 
-    @property
-    def is_etf(self) -> bool:
-        return self.ticker in SPRINT3_SATELLITE_ETFS
 
+# Explicit signature: compiled at import (declaration), not on first call.
+# Also used by build_sprint3_kernel.py for the ahead-of-time build.
+SCORE_KERNEL_SIGNATURE = 'Tuple((f8, b1, b1))(f8, f8, f8, f8, f8, f8, f8, f8, f8)'
 
-def calculate_sprint3_score(
-    ticker_data: Dict,
-    voo_data: Dict
-) -> Optional[Sprint3Candidate]:
+
+@njit(SCORE_KERNEL_SIGNATURE, cache=True, fastmath=True)
+def _score_kernel(r3, r10, vol10, voo_r3, voo_r10, price, sma20, sma50, min_price):
     """
-    Calculate ForecastScore for a satellite candidate.
+    Numeric core of the ForecastScore (JIT-compiled when numba is installed).
 
-    Score = 0.55*rr3 + 0.35*rr10 - 0.25*vol10
+    Returns:
+        Tuple of (score, trend_ok, eligible_price)
+    """
+    score = _W_RR3 * (r3 - voo_r3) + _W_RR10 * (r10 - voo_r10) - _W_VOL10 * vol10
 
-    Where:
-    - rr3 = ticker's 3-day return - VOO's 3-day return (relative momentum)
-    - rr10 = ticker's 10-day return - VOO's 10-day return
-    - vol10 = standard deviation of daily returns over 10 days
+    # Trend filter: Close > SMA20 AND SMA20 > SMA50 (pass if SMAs unknown)
+    if sma20 != 0.0 and sma50 != 0.0:
+        trend_ok = price > sma20 and sma20 > sma50
+    else:
+        trend_ok = True
 
-    This score rewards short-term relative momentum while penalizing volatility.
+    return score, trend_ok, price >= min_price
 
-    UPDATED: Now uses actual r1, r3, r10, vol10, SMA20 values from market_data.py
-    instead of approximations. This improves ranking accuracy significantly.
+
+# Prefer the ahead-of-time compiled kernel when built (python build_sprint3_kernel.py)
+try:
+    from sprint3_kernel import score_kernel as _score_kernel
+except ImportError:
+    pass
+
+
+def _resolved(data: Dict, key: str, r21: float, factor: float) -> float:
+    """Return data[key], falling back to r21 * factor when missing or zero."""
+    v = data.get(key)
+    return v if v else (r21 * factor if r21 else 0.0)
+
+
+def resolve_voo_returns(voo_data: Dict) -> Tuple[float, float]:
     """
-    if not ticker_data or not voo_data:
-        return None
+    Resolve VOO's 3-day and 10-day returns (with 21-day fallback).
 
-    ticker = ticker_data.get('ticker', 'UNKNOWN')
+    These are loop-invariant across a scoring pass, so callers resolve them
+    once and pass them to calculate_sprint3_score.
+
+    Returns:
+        Tuple of (voo_r3, voo_r10)
+    """
+    # VOO ACTUAL returns for relative calculation (21-day fallback)
+    voo_r21 = voo_data.get('return_21d') or 0.0
+    voo_r3 = _resolved(voo_data, 'return_3d', voo_r21, _R3_21)
+    voo_r10 = _resolved(voo_data, 'return_10d', voo_r21, _R10_21)
+
+    return voo_r3, voo_r10
+
+
+def _extract_score_inputs(ticker_data: Dict) -> Tuple[float, float, float, float, float, float, float]:
+    """
+    Pull scoring inputs out of a ticker's market data, applying fallbacks.
+
+    Returns:
+        Tuple of (r1, r3, r10, vol10, price, sma20, sma50)
+    """
     price = ticker_data.get('price', 0)
 
     # Get ACTUAL returns from market data (not approximations!)
-    # MarketDataCollector now provides actual r1, r3, r10 values
-    r1 = ticker_data.get('return_1d', 0) or 0
-    r3 = ticker_data.get('return_3d', 0) or 0
-    r10 = ticker_data.get('return_10d', 0) or 0
-    r21 = ticker_data.get('return_21d', 0) or 0
-
-    # Fallback: If actual values not available, use approximations
-    # This maintains backwards compatibility with older cached data
-    if r3 == 0 and r21 != 0:
-        r3 = r21 * (3/21)  # Fallback approximation
-    if r10 == 0 and r21 != 0:
-        r10 = r21 * (10/21)  # Fallback approximation
-    if r1 == 0 and r21 != 0:
-        r1 = r21 * (1/21)  # Fallback approximation
-
-    # VOO ACTUAL returns for relative calculation
-    voo_r3 = voo_data.get('return_3d', 0) or 0
-    voo_r10 = voo_data.get('return_10d', 0) or 0
-
-    # Fallback for VOO if not available
-    if voo_r3 == 0:
-        voo_r21 = voo_data.get('return_21d', 0) or 0
-        voo_r3 = voo_r21 * (3/21) if voo_r21 else 0
-    if voo_r10 == 0:
-        voo_r21 = voo_data.get('return_21d', 0) or 0
-        voo_r10 = voo_r21 * (10/21) if voo_r21 else 0
-
-    # Relative returns (actual momentum vs benchmark)
-    rr3 = r3 - voo_r3
-    rr10 = r10 - voo_r10
+    # MarketDataCollector now provides actual r1, r3, r10 values.
+    # Fallback to scaled 21-day return keeps older cached data working.
+    r21 = ticker_data.get('return_21d') or 0.0
+    r1 = _resolved(ticker_data, 'return_1d', r21, _R1_21)
+    r3 = _resolved(ticker_data, 'return_3d', r21, _R3_21)
+    r10 = _resolved(ticker_data, 'return_10d', r21, _R10_21)
 
     # ACTUAL 10-day volatility (not 21-day proxy!)
     vol10 = ticker_data.get('vol10', None)
     if vol10 is None:
         # Fallback to 21-day if 10-day not available
-        vol10 = ticker_data.get('volatility_21d', 0.05) or 0.05
-
-    # ForecastScore
-    score = 0.55 * rr3 + 0.35 * rr10 - 0.25 * vol10
+        vol10 = ticker_data.get('volatility_21d', _DEFAULT_VOL) or _DEFAULT_VOL
 
     # SMAs for trend filter - use ACTUAL SMA20 now!
     sma20 = ticker_data.get('sma20', None)  # Actual SMA20 from market data
     sma50 = ticker_data.get('sma50', 0) or 0
-    sma100 = ticker_data.get('sma100', 0) or 0
-    sma200 = ticker_data.get('sma200', sma100) or sma100
 
     # Fallback SMA20 estimation only if actual not available
     if sma20 is None and price and sma50:
@@ -213,27 +289,55 @@ def calculate_sprint3_score(
     elif sma20 is None:
         sma20 = price
 
-    # Trend filter: Close > SMA20 AND SMA20 > SMA50
-    trend_ok = (price > sma20) and (sma20 > sma50) if (sma20 and sma50) else True
+    return r1, r3, r10, vol10, price, sma20, sma50
 
-    # Eligibility
-    is_eligible = True
-    disqualify_reason = None
 
-    # Check price
+def _disqualify_reason(ticker: str, price: float, trend_ok: bool) -> Optional[str]:
+    """Reason a candidate is ineligible (trend > prohibited > price), or None."""
+    if not trend_ok:
+        return "Trend filter failed"
+    if _is_prohibited(ticker):
+        return "Prohibited security"
     if price < SPRINT3_MIN_PRICE:
-        is_eligible = False
-        disqualify_reason = f"Price ${price:.2f} < ${SPRINT3_MIN_PRICE}"
+        return f"Price ${price:.2f} < ${SPRINT3_MIN_PRICE}"
+    return None
 
-    # Check prohibited
-    if is_prohibited(ticker):
-        is_eligible = False
-        disqualify_reason = "Prohibited security"
 
-    # Check trend
-    if not trend_ok:
-        is_eligible = False
-        disqualify_reason = "Trend filter failed"
+def calculate_sprint3_score(
+    ticker_data: Dict,
+    voo_r3: float,
+    voo_r10: float
+) -> Optional[Sprint3Candidate]:
+    """
+    Calculate ForecastScore for a satellite candidate.
+
+    Score = 0.55*rr3 + 0.35*rr10 - 0.25*vol10
+
+    Where:
+    - rr3 = ticker's 3-day return - VOO's 3-day return (relative momentum)
+    - rr10 = ticker's 10-day return - VOO's 10-day return
+    - vol10 = standard deviation of daily returns over 10 days
+
+    This score rewards short-term relative momentum while penalizing volatility.
+    VOO returns are passed pre-resolved (see resolve_voo_returns).
+
+    UPDATED: Now uses actual r1, r3, r10, vol10, SMA20 values from market_data.py
+    instead of approximations. This improves ranking accuracy significantly.
+    """
+    if not ticker_data:
+        return None
+
+    ticker = ticker_data.get('ticker', 'UNKNOWN')
+    r1, r3, r10, vol10, price, sma20, sma50 = _extract_score_inputs(ticker_data)
+
+    # ForecastScore + trend filter (Close > SMA20 AND SMA20 > SMA50)
+    score, trend_ok, price_ok = _score_kernel(
+        float(r3), float(r10), float(vol10), float(voo_r3), float(voo_r10),
+        float(price or 0), float(sma20 or 0), float(sma50), SPRINT3_MIN_PRICE
+    )
+
+    # Eligibility
+    disqualify_reason = _disqualify_reason(ticker, price, trend_ok)
 
     return Sprint3Candidate(
         ticker=ticker,
@@ -241,54 +345,279 @@ def calculate_sprint3_score(
         r1=r1,
         r3=r3,
         r10=r10,
-        rr3=rr3,
-        rr10=rr10,
+        rr3=r3 - voo_r3,
+        rr10=r10 - voo_r10,
         vol10=vol10,
         price=price,
         sma20=sma20,
         sma50=sma50,
         trend_ok=trend_ok,
-        is_eligible=is_eligible,
-        disqualify_reason=disqualify_reason
+        is_eligible=disqualify_reason is None,
+        disqualify_reason=disqualify_reason,
+        is_etf=ticker in _SATELLITE_ETF_SET
     )
 
 
-def score_all_sprint3_candidates(market_data: Dict) -> List[Sprint3Candidate]:
+def _forecast_score(r3: np.ndarray, r10: np.ndarray, vol10: np.ndarray,
+                    voo_r3: float, voo_r10: float) -> np.ndarray:
+    """ForecastScore over whole columns (same formula as _score_kernel)."""
+    return _W_RR3 * (r3 - voo_r3) + _W_RR10 * (r10 - voo_r10) - _W_VOL10 * vol10
+
+
+@njit('f8[:](f8[:], f8[:], f8[:], f8, f8)', cache=True, fastmath=True)
+def _forecast_score_fused(r3, r10, vol10, voo_r3, voo_r10):
+    """Single-pass ForecastScore loop - no intermediate arrays (numba only)."""
+    out = np.empty(r3.shape[0])
+    for i in range(r3.shape[0]):
+        out[i] = _W_RR3 * (r3[i] - voo_r3) + _W_RR10 * (r10[i] - voo_r10) - _W_VOL10 * vol10[i]
+    return out
+
+
+@njit('Tuple((f8[:], b1[:], b1[:]))(f8[:, :], f8, f8, f8)', parallel=True, cache=True, fastmath=True)
+def _score_rows_parallel(values, voo_r3, voo_r10, min_price):
     """
-    Score all satellites in the sprint3 universe.
+    Score a (N, 7) matrix of _extract_score_inputs rows across cores (numba only).
+
+    Returns:
+        Tuple of (score, trend_ok, price_ok) arrays
+    """
+    n = values.shape[0]
+    score = np.empty(n)
+    trend_ok = np.empty(n, dtype=np.bool_)
+    price_ok = np.empty(n, dtype=np.bool_)
+    for i in prange(n):
+        price = values[i, 4]
+        sma20 = values[i, 5]
+        sma50 = values[i, 6]
+        score[i] = (_W_RR3 * (values[i, 1] - voo_r3) + _W_RR10 * (values[i, 2] - voo_r10)
+                    - _W_VOL10 * values[i, 3])
+        trend_ok[i] = (price > sma20 and sma20 > sma50) or sma20 == 0.0 or sma50 == 0.0
+        price_ok[i] = price >= min_price
+    return score, trend_ok, price_ok
+
+
+# The NumPy expression is faster than an interpreted loop when numba is absent
+if _HAVE_NUMBA:
+    _forecast_score = _forecast_score_fused
+
+
+def _fill_missing(col: np.ndarray, fallback) -> np.ndarray:
+    """Replace missing (NaN) and zero entries of col with fallback."""
+    return np.where(np.isnan(col) | (col == 0), fallback, col)
+
+
+def _table_score_inputs(table: MarketDataTable) -> np.ndarray:
+    """
+    Column-wise equivalent of _extract_score_inputs over a MarketDataTable.
+
+    Returns:
+        (N, 7) float64 matrix with columns r1, r3, r10, vol10, price, sma20, sma50
+        (missing values resolved to 0 as in the per-ticker path)
+    """
+    col = table.column
+    price = np.nan_to_num(col('price'))
+    r21 = np.nan_to_num(col('return_21d'))
+
+    # Actual returns, falling back to the scaled 21-day return
+    r1 = _fill_missing(col('return_1d'), r21 * _R1_21)
+    r3 = _fill_missing(col('return_3d'), r21 * _R3_21)
+    r10 = _fill_missing(col('return_10d'), r21 * _R10_21)
+
+    # Actual 10-day volatility, else 21-day, else default
+    vol10 = col('vol10')
+    vol10 = np.where(np.isnan(vol10), _fill_missing(col('volatility_21d'), _DEFAULT_VOL), vol10)
+
+    # SMA20 fallback: midpoint of price and SMA50, else price
+    sma50 = np.nan_to_num(col('sma50'))
+    sma20 = col('sma20')
+    sma20 = np.where(
+        np.isnan(sma20),
+        np.where((price != 0) & (sma50 != 0), (price + sma50) / 2, price),
+        sma20
+    )
+
+    return np.column_stack((r1, r3, r10, vol10, price, sma20, sma50))
+
+
+def score_batch(market_data: Dict, tickers: List[str],
+                voo_r3: float, voo_r10: float) -> Tuple[List[str], np.ndarray]:
+    """
+    Vectorized ForecastScore for an arbitrary list of tickers.
+
+    Tickers without market data are skipped (as calculate_sprint3_score would).
+
+    Returns:
+        Tuple of (scored_tickers, scores) with scores aligned to scored_tickers
+    """
+    table = MarketDataTable.from_market_data(market_data, tickers)
+    values = _table_score_inputs(table)
+    return list(table.tickers), _forecast_score(values[:, 1], values[:, 2], values[:, 3], voo_r3, voo_r10)
+
+
+def _score_universe_columns(market_data: Dict, voo_r3: float, voo_r10: float) -> Dict[str, np.ndarray]:
+    """
+    Score the sprint3 universe as parallel NumPy columns.
+
+    The universe is loaded into a MarketDataTable once; fallbacks, score,
+    trend and eligibility are then evaluated as whole-column passes with no
+    per-ticker Python branching. Tickers without data are skipped.
+
+    Returns:
+        Dict of equal-length arrays: 'tickers', 'r1', 'r3', 'r10', 'vol10',
+        'price', 'sma20', 'sma50', 'score', 'trend_ok', 'eligible'
+    """
+    table = MarketDataTable.from_market_data(market_data, SPRINT3_SATELLITE_UNIVERSE)
+    universe_idx = [_UNIVERSE_INDEX[t] for t in table.tickers]
 
-    Returns candidates sorted by score (highest first).
+    values = _table_score_inputs(table)
+    r1, r3, r10, vol10, price, sma20, sma50 = values.T
+
+    if _HAVE_NUMBA:
+        # One parallel sweep over the dense (N, 7) matrix
+        score, trend_ok, price_ok = _score_rows_parallel(
+            values, voo_r3, voo_r10, SPRINT3_MIN_PRICE
+        )
+    else:
+        score = _forecast_score(r3, r10, vol10, voo_r3, voo_r10)
+
+        # Trend filter: Close > SMA20 AND SMA20 > SMA50 (pass if SMAs unknown)
+        has_sma = (sma20 != 0) & (sma50 != 0)
+        trend_ok = ((price > sma20) & (sma20 > sma50)) | ~has_sma
+        price_ok = price >= SPRINT3_MIN_PRICE
+
+    eligible = price_ok & ~_PROHIBITED_MASK[universe_idx] & trend_ok
+
+    return {
+        'tickers': table.tickers,
+        'r1': r1, 'r3': r3, 'r10': r10, 'vol10': vol10,
+        'price': price, 'sma20': sma20, 'sma50': sma50,
+        'score': score, 'trend_ok': trend_ok, 'eligible': eligible,
+        'voo_r3': voo_r3, 'voo_r10': voo_r10,
+    }
+
+
+def _candidate_from_columns(cols: Dict[str, np.ndarray], i: int) -> Sprint3Candidate:
+    """Materialize row i of _score_universe_columns as a Sprint3Candidate."""
+    ticker = cols['tickers'][i]
+    price = float(cols['price'][i])
+    trend_ok = bool(cols['trend_ok'][i])
+    r3 = float(cols['r3'][i])
+    r10 = float(cols['r10'][i])
+
+    # Reason string only built for rows actually materialized
+    disqualify_reason = None if cols['eligible'][i] else _disqualify_reason(ticker, price, trend_ok)
+
+    return Sprint3Candidate(
+        ticker=ticker,
+        score=float(cols['score'][i]),
+        r1=float(cols['r1'][i]),
+        r3=r3,
+        r10=r10,
+        rr3=r3 - cols['voo_r3'],
+        rr10=r10 - cols['voo_r10'],
+        vol10=float(cols['vol10'][i]),
+        price=price,
+        sma20=float(cols['sma20'][i]),
+        sma50=float(cols['sma50'][i]),
+        trend_ok=trend_ok,
+        is_eligible=bool(cols['eligible'][i]),
+        disqualify_reason=disqualify_reason,
+        is_etf=ticker in _SATELLITE_ETF_SET
+    )
+
+
+# Scored columns per market_data snapshot, so repeated top-N queries within one
+# decision cycle (different excludes/VIX) don't re-score the whole universe.
+# Entries hold a reference to market_data so its id() can't be reused while cached.
+_SCORE_CACHE: Dict[tuple, tuple] = {}
+_SCORE_CACHE_TTL_SECONDS = 60
+
+
+def clear_sprint3_cache():
+    """Drop all cached scoring results."""
+    _SCORE_CACHE.clear()
+
+
+def _get_scored_columns(market_data: Dict) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Score columns for market_data, reusing a cached result for the same snapshot.
+
+    Returns:
+        Columns from _score_universe_columns, or None if VOO data (or all of
+        its returns) is missing
     """
     voo_data = market_data.get('VOO')
     if not voo_data:
         logger.error("Cannot score candidates: VOO data missing")
+        return None
+
+    # Without any VOO return the relative scores are meaningless - skip the pass
+    if all(voo_data.get(k) is None for k in ('return_3d', 'return_10d', 'return_21d')):
+        logger.error("Cannot score candidates: VOO has no 3d/10d/21d returns")
+        return None
+
+    now = time.monotonic()
+    key = (id(market_data), market_data.get('__asof__'))
+    entry = _SCORE_CACHE.get(key)
+    if entry and entry[0] is market_data and now - entry[1] < _SCORE_CACHE_TTL_SECONDS:
+        return entry[2]
+
+    voo_r3, voo_r10 = resolve_voo_returns(voo_data)
+    cols = _score_universe_columns(market_data, voo_r3, voo_r10)
+
+    # Evict expired snapshots before storing the new one
+    for stale_key in [k for k, e in _SCORE_CACHE.items() if now - e[1] >= _SCORE_CACHE_TTL_SECONDS]:
+        del _SCORE_CACHE[stale_key]
+    _SCORE_CACHE[key] = (market_data, now, cols)
+
+    return cols
+
+
+def score_all_sprint3_candidates(market_data: Dict,
+                                 eligible_only: bool = False) -> List[Sprint3Candidate]:
+    """
+    Score all satellites in the sprint3 universe.
+
+    Args:
+        market_data: Market data dict
+        eligible_only: Only materialize candidates passing the eligibility mask
+
+    Returns candidates unsorted - callers select top-N by score
+    (see get_top_sprint3_candidates).
+    """
+    cols = _get_scored_columns(market_data)
+    if cols is None:
         return []
 
-    candidates = []
+    if eligible_only:
+        indices = np.flatnonzero(cols['eligible'])
+    else:
+        indices = range(len(cols['tickers']))
 
-    for ticker in SPRINT3_SATELLITE_UNIVERSE:
-        ticker_data = market_data.get(ticker)
-        if not ticker_data:
-            logger.debug(f"No data for {ticker}")
-            continue
+    return [_candidate_from_columns(cols, i) for i in indices]
 
-        # Add ticker to data dict
-        ticker_data['ticker'] = ticker
 
-        candidate = calculate_sprint3_score(ticker_data, voo_data)
-        if candidate:
-            candidates.append(candidate)
+def _top_indices(scores: np.ndarray, mask: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores among rows where mask is True, best first.
 
-    # Sort by score descending
-    candidates.sort(key=lambda x: x.score, reverse=True)
+    Uses np.argpartition (O(N)) and only sorts the selected k.
+    """
+    idx = np.flatnonzero(mask)
+    if k <= 0 or len(idx) == 0:
+        return idx[:0]
 
-    return candidates
+    if k < len(idx):
+        idx = np.sort(idx[np.argpartition(-scores[idx], k - 1)[:k]])
+
+    # Stable sort keeps universe order for ties
+    return idx[np.argsort(-scores[idx], kind='stable')]
 
 
 def get_top_sprint3_candidates(
     market_data: Dict,
     n: int = 16,
-    exclude_tickers: List[str] = None,
+    exclude_tickers: Iterable[str] = None,
     require_eligible: bool = True,
     vix_level: float = None
 ) -> List[Sprint3Candidate]:
@@ -298,43 +627,61 @@ def get_top_sprint3_candidates(
     Args:
         market_data: Market data dict
         n: Number of candidates to return
-        exclude_tickers: Tickers to exclude (e.g., just sold)
+        exclude_tickers: Tickers to exclude (e.g., just sold); pass a set to
+            avoid a copy
         require_eligible: Only return eligible candidates
         vix_level: Current VIX for risk regime adjustment
 
     Returns:
         Top N candidates by score
     """
-    if exclude_tickers is None:
-        exclude_tickers = []
+    if not isinstance(exclude_tickers, (set, frozenset)):
+        exclude_tickers = set(exclude_tickers or ())
 
-    all_candidates = score_all_sprint3_candidates(market_data)
+    cols = _get_scored_columns(market_data)
+    if cols is None:
+        return []
+    tickers = cols['tickers']
 
-    # Filter
-    filtered = []
-    for c in all_candidates:
-        if c.ticker in exclude_tickers:
-            continue
-        if require_eligible and not c.is_eligible:
-            continue
-        filtered.append(c)
+    # Filter mask (only the selected top-N are materialized as candidates)
+    keep = np.fromiter((t not in exclude_tickers for t in tickers), dtype=bool, count=len(tickers))
+    if require_eligible:
+        keep &= cols['eligible']
 
     # Risk regime adjustment: if VOO < SMA50, prefer ETFs over single stocks
     if vix_level and vix_level > 25:
         # In high VIX, limit single-name stocks to 6
-        etfs = [c for c in filtered if c.is_etf]
-        stocks = [c for c in filtered if not c.is_etf]
-        result = etfs[:n] + stocks[:min(6, n - len(etfs[:n]))]
-        result.sort(key=lambda x: x.score, reverse=True)
-        return result[:n]
+        is_etf = np.fromiter((t in _SATELLITE_ETF_SET for t in tickers), dtype=bool, count=len(tickers))
+        etf_idx = _top_indices(cols['score'], keep & is_etf, n)
+        stock_idx = _top_indices(cols['score'], keep & ~is_etf, min(6, n - len(etf_idx)))
+        etfs = [_candidate_from_columns(cols, i) for i in etf_idx]
+        stocks = [_candidate_from_columns(cols, i) for i in stock_idx]
+        # Both lists are already score-ordered (and total <= n) - merge, don't re-sort
+        return list(merge(etfs, stocks, key=_by_score, reverse=True))
 
-    return filtered[:n]
+    return [_candidate_from_columns(cols, i) for i in _top_indices(cols['score'], keep, n)]
 
 
 # =============================================================================
 # HOLDING PERIOD VALIDATION
 # =============================================================================
 
+@lru_cache(maxsize=2048)
+def _parse_buy_time(buy_time_str: str) -> datetime:
+    """
+    Parse a position buy time string (memoized - polled repeatedly per position).
+
+    Date-only values are assumed to be market close (4:00 PM ET).
+    Raises ValueError if unparseable.
+    """
+    if 'T' in buy_time_str:
+        return datetime.fromisoformat(buy_time_str.replace('Z', '+00:00'))
+
+    # Date only - assume market close (4:00 PM ET)
+    buy_date = datetime.fromisoformat(buy_time_str)
+    return _ET.localize(buy_date.replace(hour=16, minute=0))
+
+
 def can_sell_sprint3(position: Dict, current_time: datetime = None) -> Tuple[bool, str]:
     """
     Check if a position can be sold (24h + buffer elapsed).
@@ -347,7 +694,7 @@ def can_sell_sprint3(position: Dict, current_time: datetime = None) -> Tuple[boo
         Tuple of (can_sell, reason)
     """
     if current_time is None:
-        current_time = datetime.now(pytz.timezone('US/Eastern'))
+        current_time = datetime.now(_ET)
 
     # Get buy time
     buy_time_str = position.get('buy_fill_time') or position.get('entry_date')
@@ -356,23 +703,14 @@ def can_sell_sprint3(position: Dict, current_time: datetime = None) -> Tuple[boo
         return True, "No buy time recorded - assuming eligible"
 
     try:
-        # Parse buy time
-        if 'T' in buy_time_str:
-            buy_time = datetime.fromisoformat(buy_time_str.replace('Z', '+00:00'))
-        else:
-            # Date only - assume market close (4:00 PM ET)
-            buy_date = datetime.fromisoformat(buy_time_str)
-            et = pytz.timezone('US/Eastern')
-            buy_time = et.localize(buy_date.replace(hour=16, minute=0))
+        buy_time = _parse_buy_time(buy_time_str)
 
         # Make current_time timezone aware if needed
         if current_time.tzinfo is None:
-            et = pytz.timezone('US/Eastern')
-            current_time = et.localize(current_time)
+            current_time = _ET.localize(current_time)
 
         # Minimum hold: 24h + buffer
-        min_hold_delta = timedelta(hours=24, seconds=SPRINT3_HOLD_BUFFER_SECONDS)
-        earliest_sell = buy_time + min_hold_delta
+        earliest_sell = buy_time + _MIN_HOLD_DELTA
 
         if current_time >= earliest_sell:
             return True, f"Held {(current_time - buy_time).total_seconds() / 3600:.1f}h"
@@ -381,65 +719,92 @@ def can_sell_sprint3(position: Dict, current_time: datetime = None) -> Tuple[boo
             return False, f"Need {remaining:.0f} more minutes"
 
     except Exception as e:
-        logger.warning(f"Error parsing buy time '{buy_time_str}': {e}")
+        logger.warning("Error parsing buy time '%s': %s", buy_time_str, e)
         return True, "Parse error - assuming eligible"
 
 
-def is_market_open() -> Tuple[bool, str]:
+def is_market_open(now: datetime = None) -> Tuple[bool, str]:
     """
     Check if market is currently open.
 
+    Args:
+        now: Current ET time (pass one timestamp when checking several gates)
+
     Returns:
         Tuple of (is_open, reason)
     """
-    et = pytz.timezone('US/Eastern')
-    now = datetime.now(et)
+    if now is None:
+        now = datetime.now(_ET)
 
     # Check day of week (Monday=0, Friday=4)
     if now.weekday() > 4:
         return False, f"Weekend (day {now.weekday()})"
 
     # Check time
-    market_open = now.replace(hour=9, minute=30, second=0, microsecond=0)
-    market_close = now.replace(hour=16, minute=0, second=0, microsecond=0)
+    t = now.time()
 
-    if now < market_open:
+    if t < _MARKET_OPEN_T:
         return False, f"Pre-market ({now.strftime('%H:%M')} ET)"
 
-    if now >= market_close:
+    if t >= _MARKET_CLOSE_T:
         return False, f"After hours ({now.strftime('%H:%M')} ET)"
 
     return True, f"Market open ({now.strftime('%H:%M')} ET)"
 
 
-def is_in_execution_window() -> Tuple[bool, str]:
+def is_in_execution_window(now: datetime = None) -> Tuple[bool, str]:
     """
     Check if we're in the sprint3 execution window (9:40-10:05 AM ET).
 
     Morning window provides stable execution after initial market volatility.
     The 24-hour hold is enforced via timestamps, not trading times.
-    """
-    et = pytz.timezone('US/Eastern')
-    now = datetime.now(et)
 
-    # Parse window times
-    window_start = datetime.strptime(SPRINT3_EXECUTION_WINDOW_START, "%H:%M")
-    window_end = datetime.strptime(SPRINT3_EXECUTION_WINDOW_END, "%H:%M")
+    Args:
+        now: Current ET time (pass one timestamp when checking several gates)
+    """
+    if now is None:
+        now = datetime.now(_ET)
 
     current_time = now.time()
-    start_time = window_start.time()
-    end_time = window_end.time()
 
-    if start_time <= current_time < end_time:
+    if _WINDOW_START_TIME <= current_time < _WINDOW_END_TIME:
         return True, f"In execution window ({now.strftime('%H:%M')} ET)"
 
     return False, f"Outside window ({now.strftime('%H:%M')} ET, window is {SPRINT3_EXECUTION_WINDOW_START}-{SPRINT3_EXECUTION_WINDOW_END})"
 
 
+def gate_check(now: datetime = None) -> Tuple[bool, bool, str]:
+    """
+    Run the market-open and execution-window gates against one timestamp.
+
+    Returns:
+        Tuple of (market_open, in_window, reason) where reason describes
+        the first failing gate (or the window status if both pass)
+    """
+    if now is None:
+        now = datetime.now(_ET)
+
+    market_open, market_reason = is_market_open(now)
+    in_window, window_reason = is_in_execution_window(now)
+
+    return market_open, in_window, window_reason if market_open else market_reason
+
+
 # =============================================================================
 # SPRINT3 EXECUTION
 # =============================================================================
 
+# Executor-side defaults for keys missing from older state files
+# ('mode' is left to StateManager.get_sprint3_state so activation isn't implied)
+_SPRINT_STATE_DEFAULTS = {
+    'sprint_day': 0,
+    'trades_used_sprint': 0,
+    'last_run_time': None,
+    'last_run_day': None,
+    'satellites_held': list,
+}
+
+
 class Sprint3Executor:
     """
     Executes the 3-day sprint strategy.
@@ -454,26 +819,37 @@ class Sprint3Executor:
         self.state = state
         self.dry_run = dry_run
         self.collector = MarketDataCollector()
+        self.order_bucket = TokenBucket(SPRINT3_ORDER_RATE_PER_SEC, SPRINT3_ORDER_BURST)
+        self._sprint_ref = None
+        self._pipeline = None
 
     def get_sprint_state(self) -> Dict:
-        """Get current sprint state from state manager."""
-        sprint_state = self.state.state.get('sprint3', {})
-        return {
-            'mode': sprint_state.get('mode', 'SPRINT3'),
-            'sprint_day': sprint_state.get('sprint_day', 0),
-            'trades_used_sprint': sprint_state.get('trades_used_sprint', 0),
-            'last_run_time': sprint_state.get('last_run_time'),
-            'last_run_day': sprint_state.get('last_run_day'),
-            'satellites_held': sprint_state.get('satellites_held', []),
-        }
+        """
+        Get current sprint state from state manager.
 
-    def update_sprint_state(self, **kwargs):
-        """Update sprint state in state manager."""
-        if 'sprint3' not in self.state.state:
-            self.state.state['sprint3'] = {}
+        Returns the live state['sprint3'] dict (defaults filled in once) -
+        treat as read-only and write through update_sprint_state.
+        """
+        sprint_state = self._sprint_ref
+        if sprint_state is None or self.state.state.get('sprint3') is not sprint_state:
+            sprint_state = self.state.get_sprint3_state()
+            for key, default in _SPRINT_STATE_DEFAULTS.items():
+                sprint_state.setdefault(key, default() if callable(default) else default)
+            self._sprint_ref = sprint_state
+        return sprint_state
+
+    def update_sprint_state(self, save: bool = True, **kwargs):
+        """
+        Update sprint state in state manager.
 
-        self.state.state['sprint3'].update(kwargs)
-        self.state.save()
+        Args:
+            save: Persist immediately; day executors pass False and let
+                execute_sprint_day save once at the end of the run
+        """
+        self.get_sprint_state().update(kwargs)
+
+        if save:
+            self.state.save()
 
     def get_trades_budget(self) -> Dict:
         """Calculate trade budget for sprint."""
@@ -497,38 +873,44 @@ class Sprint3Executor:
         sprint = self.get_sprint_state()
         budget = self.get_trades_budget()
 
-        print("\n" + "=" * 70)
-        print("SPRINT3 STATUS")
-        print("=" * 70)
-        print(f"Mode:              {sprint['mode']}")
-        print(f"Sprint Day:        {sprint['sprint_day']}/3")
-        print(f"Last Run:          {sprint['last_run_time'] or 'Never'}")
-        print("-" * 70)
-        print(f"Total Trades Used: {budget['total_used']}/80")
-        print(f"Sprint Cap:        {budget['sprint_cap']}")
-        print(f"Sprint Used:       {budget['sprint_used']}")
-        print(f"Sprint Remaining:  {budget['sprint_remaining']}")
-        print("-" * 70)
-
         # Market status
-        market_open, market_reason = is_market_open()
-        in_window, window_reason = is_in_execution_window()
-        print(f"Market:            {market_reason}")
-        print(f"Execution Window:  {window_reason}")
-        print("-" * 70)
+        now = datetime.now(_ET)
+        market_open, market_reason = is_market_open(now)
+        in_window, window_reason = is_in_execution_window(now)
 
         # Current positions
         positions = self.state.get_positions()
-        core_count = sum(1 for t in positions if t in SPRINT3_CORE)
+        core_count = sum(1 for t in positions if t in SPRINT3_CORE_SET)
         satellite_count = len(positions) - core_count
-        print(f"Positions:         {len(positions)} total ({core_count} core, {satellite_count} satellites)")
+
+        # Built as one block and written once
+        lines = [
+            "",
+            "=" * 70,
+            "SPRINT3 STATUS",
+            "=" * 70,
+            f"Mode:              {sprint.get('mode', 'SPRINT3')}",
+            f"Sprint Day:        {sprint['sprint_day']}/3",
+            f"Last Run:          {sprint['last_run_time'] or 'Never'}",
+            "-" * 70,
+            f"Total Trades Used: {budget['total_used']}/80",
+            f"Sprint Cap:        {budget['sprint_cap']}",
+            f"Sprint Used:       {budget['sprint_used']}",
+            f"Sprint Remaining:  {budget['sprint_remaining']}",
+            "-" * 70,
+            f"Market:            {market_reason}",
+            f"Execution Window:  {window_reason}",
+            "-" * 70,
+            f"Positions:         {len(positions)} total ({core_count} core, {satellite_count} satellites)",
+        ]
 
         if sprint['satellites_held']:
-            print(f"Satellites Held:   {', '.join(sprint['satellites_held'][:8])}")
+            lines.append(f"Satellites Held:   {', '.join(sprint['satellites_held'][:8])}")
             if len(sprint['satellites_held']) > 8:
-                print(f"                   {', '.join(sprint['satellites_held'][8:])}")
+                lines.append(f"                   {', '.join(sprint['satellites_held'][8:])}")
 
-        print("=" * 70)
+        lines.append("=" * 70)
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def execute_sprint_day(self, force_day: int = None) -> Dict:
         """
@@ -540,19 +922,22 @@ class Sprint3Executor:
         Returns:
             Execution result dict
         """
-        # Check market is open
-        market_open, market_reason = is_market_open()
+        # One local timestamp for the whole run
+        now = datetime.now()
+        today_iso = now.date().isoformat()
+
+        # Check market is open and execution window (single timestamp)
+        market_open, in_window, gate_reason = gate_check()
         if not market_open and not self.dry_run:
             return {
                 'success': False,
-                'error': f"Market closed: {market_reason}",
+                'error': f"Market closed: {gate_reason}",
                 'trades_executed': 0
             }
 
         # Check execution window
-        in_window, window_reason = is_in_execution_window()
         if not in_window and not self.dry_run:
-            logger.warning(f"Outside execution window: {window_reason}")
+            logger.warning("Outside execution window: %s", gate_reason)
             # Continue with warning - allow for testing
 
         # ==========================================================================
@@ -569,14 +954,14 @@ class Sprint3Executor:
                 )
 
                 if audit_result.duplicate_orders:
-                    logger.info(f"Cleaned up {len(audit_result.duplicate_orders)} duplicate orders")
+                    logger.info("Cleaned up %s duplicate orders", len(audit_result.duplicate_orders))
 
                 if not queue_healthy:
-                    logger.warning(f"Queue issues: {len(audit_result.warnings)} warnings")
+                    logger.warning("Queue issues: %s warnings", len(audit_result.warnings))
 
-                logger.info(f"Queue: {audit_result.total_orders} pending orders")
+                logger.info("Queue: %s pending orders", audit_result.total_orders)
             except Exception as e:
-                logger.warning(f"Queue management failed (non-critical): {e}")
+                logger.warning("Queue management failed (non-critical): %s", e)
 
         # Determine sprint day
         sprint_state = self.get_sprint_state()
@@ -589,8 +974,7 @@ class Sprint3Executor:
         elif current_day < 3:
             # Check if we already ran today
             last_run = sprint_state.get('last_run_day')
-            today = datetime.now().date().isoformat()
-            if last_run == today:
+            if last_run == today_iso:
                 return {
                     'success': False,
                     'error': f"Already ran sprint day {current_day} today",
@@ -604,24 +988,25 @@ class Sprint3Executor:
                 'trades_executed': 0
             }
 
-        logger.info(f"Executing SPRINT3 Day {next_day}")
+        logger.info("Executing SPRINT3 Day %s", next_day)
 
-        # Execute appropriate day
-        if next_day == 1:
-            result = self._execute_day1()
-        elif next_day == 2:
-            result = self._execute_day2()
-        else:
-            result = self._execute_day3()
-
-        # Update sprint state
-        if result['success']:
-            self.update_sprint_state(
-                sprint_day=next_day,
-                trades_used_sprint=self.get_sprint_state()['trades_used_sprint'] + result['trades_executed'],
-                last_run_time=datetime.now().isoformat(),
-                last_run_day=datetime.now().date().isoformat()
-            )
+        # Execute appropriate day - position/trade updates are saved once at the end
+        with self.state.defer_save():
+            if next_day == 1:
+                result = self._execute_day1()
+            elif next_day == 2:
+                result = self._execute_day2()
+            else:
+                result = self._execute_day3()
+
+            # Update sprint state
+            if result['success']:
+                self.update_sprint_state(
+                    sprint_day=next_day,
+                    trades_used_sprint=self.get_sprint_state()['trades_used_sprint'] + result['trades_executed'],
+                    last_run_time=now.isoformat(),
+                    last_run_day=today_iso
+                )
 
         return result
 
@@ -639,9 +1024,7 @@ class Sprint3Executor:
         errors = []
 
         # Get market data
-        market_data = self.collector.get_all_data(
-            list(SPRINT3_CORE.keys()) + SPRINT3_SATELLITE_UNIVERSE
-        )
+        market_data = self.collector.get_all_data_concurrent(SPRINT3_FULL_UNIVERSE)
 
         if not market_data.get('VOO'):
             return {'success': False, 'error': 'Could not fetch market data', 'trades_executed': 0}
@@ -659,20 +1042,20 @@ class Sprint3Executor:
         # Build core positions if needed
         for ticker, target_pct in SPRINT3_CORE.items():
             if ticker in positions:
-                logger.info(f"CORE {ticker}: Already held, skipping")
+                logger.info("CORE %s: Already held, skipping", ticker)
                 continue
 
             ticker_data = market_data.get(ticker, {})
             price = ticker_data.get('price', 0)
 
             if price < 1:
-                logger.warning(f"CORE {ticker}: No price data")
+                logger.warning("CORE %s: No price data", ticker)
                 continue
 
             shares = calculate_shares_for_allocation(portfolio_value, target_pct, price)
 
             if shares < 1:
-                logger.warning(f"CORE {ticker}: Position too small")
+                logger.warning("CORE %s: Position too small", ticker)
                 continue
 
             result = self._execute_buy(ticker, shares, f"SPRINT3_D1_CORE_{target_pct*100:.0f}PCT", price)
@@ -686,11 +1069,11 @@ class Sprint3Executor:
         candidates = get_top_sprint3_candidates(
             market_data,
             n=SPRINT3_SATELLITE_COUNT,
-            exclude_tickers=list(positions.keys()),
+            exclude_tickers=set(positions),
             require_eligible=True
         )
 
-        logger.info(f"Found {len(candidates)} eligible satellite candidates")
+        logger.info("Found %s eligible satellite candidates", len(candidates))
 
         # Buy satellites
         satellites_bought = []
@@ -704,7 +1087,7 @@ class Sprint3Executor:
             )
 
             if shares < 1:
-                logger.debug(f"SATELLITE {candidate.ticker}: Position too small")
+                logger.debug("SATELLITE %s: Position too small", candidate.ticker)
                 continue
 
             result = self._execute_buy(
@@ -723,12 +1106,10 @@ class Sprint3Executor:
             else:
                 errors.append(f"{candidate.ticker}: {result.get('error')}")
 
-            time.sleep(3)  # Delay between trades
-
         # Update sprint state with satellites
-        self.update_sprint_state(satellites_held=satellites_bought)
+        self.update_sprint_state(satellites_held=satellites_bought, save=False)
 
-        logger.info(f"Day 1 complete: {trades_executed} trades, {len(errors)} errors")
+        logger.info("Day 1 complete: %s trades, %s errors", trades_executed, len(errors))
 
         return {
             'success': True,
@@ -753,9 +1134,7 @@ class Sprint3Executor:
         buys_executed = []
 
         # Get market data
-        market_data = self.collector.get_all_data(
-            list(SPRINT3_CORE.keys()) + SPRINT3_SATELLITE_UNIVERSE
-        )
+        market_data = self.collector.get_all_data_concurrent(SPRINT3_FULL_UNIVERSE)
 
         if not market_data.get('VOO'):
             return {'success': False, 'error': 'Could not fetch market data', 'trades_executed': 0}
@@ -770,24 +1149,29 @@ class Sprint3Executor:
         sprint_state = self.get_sprint_state()
         satellites_held = sprint_state.get('satellites_held', [])
 
-        # Sell all satellites (if 24h elapsed)
+        # Screen all satellites up front (24h hold, shares) so the broker
+        # loop below only touches sellable positions. Orders themselves stay
+        # sequential - they all drive the same browser page.
+        sell_orders = []
         for ticker in satellites_held:
             if ticker not in positions:
-                logger.debug(f"SELL {ticker}: Not in positions")
+                logger.debug("SELL %s: Not in positions", ticker)
                 continue
 
             position = positions[ticker]
             can_sell, reason = can_sell_sprint3(position)
 
             if not can_sell:
-                logger.warning(f"SELL {ticker}: Cannot sell - {reason}")
+                logger.warning("SELL %s: Cannot sell - %s", ticker, reason)
                 errors.append(f"{ticker}: {reason}")
                 continue
 
             shares = position.get('shares', 0)
-            if shares < 1:
-                continue
+            if shares >= 1:
+                sell_orders.append((ticker, shares))
 
+        # Sell all sellable satellites
+        for ticker, shares in sell_orders:
             result = self._execute_sell(ticker, shares, f"SPRINT3_D2_ROTATE")
             if result['success']:
                 trades_executed += 1
@@ -796,22 +1180,20 @@ class Sprint3Executor:
             else:
                 errors.append(f"SELL {ticker}: {result.get('error')}")
 
-            time.sleep(3)
-
-        logger.info(f"Sells complete: {len(sells_executed)}")
+        logger.info("Sells complete: %s", len(sells_executed))
 
         # Get new top candidates (excluding just-sold)
         candidates = get_top_sprint3_candidates(
             market_data,
             n=SPRINT3_SATELLITE_COUNT,
-            exclude_tickers=sells_executed + list(SPRINT3_CORE.keys()),
+            exclude_tickers=SPRINT3_CORE_SET.union(sells_executed),
             require_eligible=True
         )
 
-        # Buy new satellites
+        # Buy new satellites (budget read once, then counted down locally)
+        sprint_remaining = self.get_trades_budget()['sprint_remaining']
         for candidate in candidates:
-            budget = self.get_trades_budget()
-            if budget['sprint_remaining'] <= 0:
+            if sprint_remaining <= 0:
                 logger.warning("Sprint budget exhausted")
                 break
 
@@ -835,15 +1217,17 @@ class Sprint3Executor:
                     bucket=get_bucket_for_ticker(candidate.ticker) or 'SATELLITE'
                 )
                 buys_executed.append(candidate.ticker)
+                sprint_remaining -= 1
             else:
                 errors.append(f"BUY {candidate.ticker}: {result.get('error')}")
 
-            time.sleep(3)
+        logger.info("Sprint budget after buys: %s local, %s recorded",
+                    sprint_remaining, self.get_trades_budget()['sprint_remaining'])
 
         # Update satellites held
-        self.update_sprint_state(satellites_held=buys_executed)
+        self.update_sprint_state(satellites_held=buys_executed, save=False)
 
-        logger.info(f"Day 2 complete: {trades_executed} trades ({len(sells_executed)} sells, {len(buys_executed)} buys)")
+        logger.info("Day 2 complete: %s trades (%s sells, %s buys)", trades_executed, len(sells_executed), len(buys_executed))
 
         return {
             'success': True,
@@ -871,7 +1255,7 @@ class Sprint3Executor:
         budget = self.get_trades_budget()
         rotations_available = budget['sprint_remaining'] // 2
 
-        logger.info(f"Budget allows {rotations_available} rotations ({budget['sprint_remaining']} trades)")
+        logger.info("Budget allows %s rotations (%s trades)", rotations_available, budget['sprint_remaining'])
 
         if rotations_available < 1:
             return {
@@ -881,9 +1265,7 @@ class Sprint3Executor:
             }
 
         # Get market data
-        market_data = self.collector.get_all_data(
-            list(SPRINT3_CORE.keys()) + SPRINT3_SATELLITE_UNIVERSE
-        )
+        market_data = self.collector.get_all_data_concurrent(SPRINT3_FULL_UNIVERSE)
 
         if not market_data.get('VOO'):
             return {'success': False, 'error': 'Could not fetch market data', 'trades_executed': 0}
@@ -899,26 +1281,21 @@ class Sprint3Executor:
         satellites_held = sprint_state.get('satellites_held', [])
 
         # Score current satellites to find worst ones to rotate
-        current_scores = []
-        for ticker in satellites_held:
-            if ticker not in positions:
-                continue
-            ticker_data = market_data.get(ticker, {})
-            if ticker_data:
-                ticker_data['ticker'] = ticker
-                candidate = calculate_sprint3_score(ticker_data, market_data.get('VOO', {}))
-                if candidate:
-                    current_scores.append((ticker, candidate.score, positions[ticker]))
+        voo_r3, voo_r10 = resolve_voo_returns(market_data['VOO'])
+        held, scores = score_batch(
+            market_data, [t for t in satellites_held if t in positions], voo_r3, voo_r10
+        )
 
-        # Sort by score ascending (worst first)
-        current_scores.sort(key=lambda x: x[1])
+        # Worst performers first (lowest scores)
+        worst = _top_indices(-scores, np.ones(len(held), dtype=bool), rotations_available)
 
         # Rotate worst performers
         rotations_done = 0
-        for ticker, score, position in current_scores[:rotations_available]:
+        for i in worst:
+            ticker, position = held[i], positions[held[i]]
             can_sell, reason = can_sell_sprint3(position)
             if not can_sell:
-                logger.warning(f"SELL {ticker}: Cannot sell - {reason}")
+                logger.warning("SELL %s: Cannot sell - %s", ticker, reason)
                 continue
 
             shares = position.get('shares', 0)
@@ -935,14 +1312,13 @@ class Sprint3Executor:
                 errors.append(f"SELL {ticker}: {result.get('error')}")
                 continue
 
-            time.sleep(3)
             rotations_done += 1
 
         # Get new candidates
         candidates = get_top_sprint3_candidates(
             market_data,
             n=len(sells_executed),
-            exclude_tickers=list(positions.keys()) + sells_executed,
+            exclude_tickers=set(positions).union(sells_executed),
             require_eligible=True
         )
 
@@ -971,13 +1347,12 @@ class Sprint3Executor:
             else:
                 errors.append(f"BUY {candidate.ticker}: {result.get('error')}")
 
-            time.sleep(3)
-
         # Update satellites held
-        new_satellites = [t for t in satellites_held if t not in sells_executed] + buys_executed
-        self.update_sprint_state(satellites_held=new_satellites)
+        sold = set(sells_executed)
+        new_satellites = [t for t in satellites_held if t not in sold] + buys_executed
+        self.update_sprint_state(satellites_held=new_satellites, save=False)
 
-        logger.info(f"Day 3 complete: {trades_executed} trades ({len(sells_executed)} sells, {len(buys_executed)} buys)")
+        logger.info("Day 3 complete: %s trades (%s sells, %s buys)", trades_executed, len(sells_executed), len(buys_executed))
         logger.info("SPRINT3 COMPLETE!")
 
         return {
@@ -988,19 +1363,26 @@ class Sprint3Executor:
             'errors': errors
         }
 
+    def _get_pipeline(self) -> ExecutionPipeline:
+        """One ExecutionPipeline per executor, created on first order and reused."""
+        if self._pipeline is None:
+            self._pipeline = ExecutionPipeline(self.bot, state_manager=self.state, dry_run=self.dry_run)
+        elif self._pipeline.page is not self.bot.page:
+            # Browser was restarted - follow the bot's current page
+            self._pipeline.page = self.bot.page
+        return self._pipeline
+
     def _execute_buy(self, ticker: str, shares: int, rationale: str, price: float) -> Dict:
         """Execute a buy order."""
-        logger.info(f"BUY {shares} {ticker} @ ~${price:.2f} ({rationale})")
+        logger.info("BUY %s %s @ ~$%.2f (%s)", shares, ticker, price, rationale)
 
         if self.dry_run:
-            logger.info(f"[DRY RUN] Would buy {shares} {ticker}")
+            logger.info("[DRY RUN] Would buy %s %s", shares, ticker)
             return {'success': True, 'dry_run': True}
 
         # Calculate limit price
         limit_price = max(round(price * 1.002, 2), SPRINT3_LIMIT_FLOOR)
 
-        from execution_pipeline import ExecutionPipeline, TradeOrder
-
         order = TradeOrder(
             ticker=ticker,
             side="BUY",
@@ -1009,7 +1391,8 @@ class Sprint3Executor:
             portfolio_pct=SPRINT3_SATELLITE_SIZE * 100
         )
 
-        pipeline = ExecutionPipeline(self.bot, state_manager=self.state, dry_run=self.dry_run)
+        pipeline = self._get_pipeline()
+        self.order_bucket.acquire()
         result = pipeline.execute(order)
 
         return {
@@ -1019,14 +1402,12 @@ class Sprint3Executor:
 
     def _execute_sell(self, ticker: str, shares: int, rationale: str) -> Dict:
         """Execute a sell order."""
-        logger.info(f"SELL {shares} {ticker} ({rationale})")
+        logger.info("SELL %s %s (%s)", shares, ticker, rationale)
 
         if self.dry_run:
-            logger.info(f"[DRY RUN] Would sell {shares} {ticker}")
+            logger.info("[DRY RUN] Would sell %s %s", shares, ticker)
             return {'success': True, 'dry_run': True}
 
-        from execution_pipeline import ExecutionPipeline, TradeOrder
-
         order = TradeOrder(
             ticker=ticker,
             side="SELL",
@@ -1034,7 +1415,8 @@ class Sprint3Executor:
             rationale=rationale
         )
 
-        pipeline = ExecutionPipeline(self.bot, state_manager=self.state, dry_run=self.dry_run)
+        pipeline = self._get_pipeline()
+        self.order_bucket.acquire()
         result = pipeline.execute(order)
 
         return {
@@ -1089,7 +1471,7 @@ def plan_sprint3(market_data: Dict, positions: Dict, sprint_day: int = 1) -> Dic
         candidates = get_top_sprint3_candidates(
             market_data,
             n=SPRINT3_SATELLITE_COUNT,
-            exclude_tickers=list(positions.keys()),
+            exclude_tickers=set(positions),
             require_eligible=True
         )
 
@@ -1107,7 +1489,7 @@ def plan_sprint3(market_data: Dict, positions: Dict, sprint_day: int = 1) -> Dic
     elif sprint_day == 2:
         # Plan all satellite sells
         for ticker in list(positions.keys()):
-            if ticker in SPRINT3_CORE:
+            if ticker in SPRINT3_CORE_SET:
                 continue
             plan['sells'].append({
                 'ticker': ticker,
@@ -1118,7 +1500,7 @@ def plan_sprint3(market_data: Dict, positions: Dict, sprint_day: int = 1) -> Dic
         candidates = get_top_sprint3_candidates(
             market_data,
             n=SPRINT3_SATELLITE_COUNT,
-            exclude_tickers=list(SPRINT3_CORE.keys()),
+            exclude_tickers=SPRINT3_CORE_SET,
             require_eligible=True
         )
 
@@ -1132,30 +1514,22 @@ def plan_sprint3(market_data: Dict, positions: Dict, sprint_day: int = 1) -> Dic
 
     elif sprint_day == 3:
         # Score current satellites
-        satellites = [t for t in positions if t not in SPRINT3_CORE]
-        scores = []
-        for ticker in satellites:
-            ticker_data = market_data.get(ticker, {})
-            if ticker_data:
-                ticker_data['ticker'] = ticker
-                c = calculate_sprint3_score(ticker_data, voo_data)
-                if c:
-                    scores.append((ticker, c.score))
-
-        scores.sort(key=lambda x: x[1])
+        satellites = [t for t in positions if t not in SPRINT3_CORE_SET]
+        voo_r3, voo_r10 = resolve_voo_returns(voo_data)
+        scored, scores = score_batch(market_data, satellites, voo_r3, voo_r10)
 
         # Plan to rotate worst 4 (example)
-        for ticker, score in scores[:4]:
+        for i in _top_indices(-scores, np.ones(len(scored), dtype=bool), 4):
             plan['sells'].append({
-                'ticker': ticker,
-                'score': score
+                'ticker': scored[i],
+                'score': float(scores[i])
             })
 
         # Get replacements
         candidates = get_top_sprint3_candidates(
             market_data,
             n=4,
-            exclude_tickers=list(positions.keys()),
+            exclude_tickers=set(positions),
             require_eligible=True
         )
 
@@ -1201,23 +1575,34 @@ def print_sprint3_plan(plan: Dict):
 
 def print_sprint3_scoring_report(market_data: Dict):
     """Print scoring report for all sprint3 candidates."""
-    candidates = score_all_sprint3_candidates(market_data)
-
-    print("\n" + "=" * 100)
-    print("SPRINT3 SATELLITE SCORING REPORT")
-    print("=" * 100)
-    print(f"{'Rank':<5} {'Ticker':<8} {'Score':>10} {'RR3':>10} {'RR10':>10} {'Vol10':>10} "
-          f"{'Price':>10} {'Trend':>8} {'Eligible':>10}")
-    print("-" * 100)
+    # Rank on the score column (stable: universe order breaks ties)
+    cols = _get_scored_columns(market_data)
+    order = np.argsort(-cols['score'], kind='stable') if cols is not None else []
+    candidates = [_candidate_from_columns(cols, i) for i in order]
+
+    rule = "=" * 100
+    header = (
+        f"\n{rule}\n"
+        "SPRINT3 SATELLITE SCORING REPORT\n"
+        f"{rule}\n"
+        f"{'Rank':<5} {'Ticker':<8} {'Score':>10} {'RR3':>10} {'RR10':>10} {'Vol10':>10} "
+        f"{'Price':>10} {'Trend':>8} {'Eligible':>10}\n"
+        f"{'-' * 100}\n"
+    )
 
-    for i, c in enumerate(candidates, 1):
+    def row(i: int, c: Sprint3Candidate) -> str:
         trend = "OK" if c.trend_ok else "FAIL"
         eligible = "YES" if c.is_eligible else c.disqualify_reason[:10] if c.disqualify_reason else "NO"
-        print(f"{i:<5} {c.ticker:<8} {c.score:>10.4f} {c.rr3:>10.4f} {c.rr10:>10.4f} "
-              f"{c.vol10:>10.4f} {c.price:>10.2f} {trend:>8} {eligible:>10}")
-
-    print("=" * 100)
+        return (f"{i:<5} {c.ticker:<8} {c.score:>10.4f} {c.rr3:>10.4f} {c.rr10:>10.4f} "
+                f"{c.vol10:>10.4f} {c.price:>10.2f} {trend:>8} {eligible:>10}\n")
 
     # Top 16 eligible
     eligible = [c for c in candidates if c.is_eligible][:16]
-    print(f"\nTOP 16 ELIGIBLE: {', '.join(c.ticker for c in eligible)}")
+
+    # One write for the whole report
+    sys.stdout.write(
+        header
+        + "".join(row(i, c) for i, c in enumerate(candidates, 1))
+        + f"{rule}\n"
+        + f"\nTOP 16 ELIGIBLE: {', '.join(c.ticker for c in eligible)}\n"
+    )
@@ -8,37 +8,182 @@ Handles persistence of bot state across restarts, including:
 - Transaction history
 
 Thread-safe: Uses file locking to prevent concurrent write corruption.
+
+Append-only history (trade log, daily values) lives in NDJSON sidecar
+files next to the state file, so saves only rewrite the small hot state.
 """
 
+import atexit
+import hashlib
+import heapq
 import json
+import math
 import os
 import logging
+import secrets
+import signal
 import threading
-import uuid
+import time
+import weakref
+from collections import defaultdict, deque
 from datetime import datetime, date, timezone, timedelta
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import Deque, Dict, Iterable, Iterator, List, Literal, Optional, Tuple
+from dataclasses import dataclass, asdict, is_dataclass
 import shutil
+from contextlib import contextmanager
+
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the stdlib encoder
+    orjson = None
 
 from config import (
     COMPETITION_START, COMPETITION_END, MAX_TRADES_TOTAL,
-    STARTING_CAPITAL
+    STARTING_CAPITAL, MIN_HOLD_SECONDS, HOLD_BUFFER_SECONDS
 )
 
 logger = logging.getLogger('stocktrak_bot.state_manager')
 
-# Global lock for thread-safe state file access
-_state_file_lock = threading.RLock()
+# Global lock for thread-safe state file access (not re-entrant: code that
+# already holds it calls the *_locked helpers)
+_state_file_lock = threading.Lock()
 
 STATE_FILE = 'bot_state.json'
 STATE_BACKUP_FILE = 'bot_state_backup.json'
 DASHBOARD_STATE_FILE = os.path.join(os.path.dirname(__file__), 'state', 'dashboard_state.json')
 
+# Seconds a lot must be held before it can be sold (24h + buffer)
+_REQUIRED_HOLD = MIN_HOLD_SECONDS + HOLD_BUFFER_SECONDS
+
+# Trade log entries kept in memory; the NDJSON sidecar keeps full history
+TRADE_LOG_MAX = 500
+
+# Local timezone used for naive (legacy) timestamps, resolved once
+_LOCAL_TZ = datetime.now().astimezone().tzinfo
+
+# Coalescing window for background state writes (see StateManager.save)
+SAVE_DEBOUNCE_SECONDS = 0.25
+
+# Debounced saves rotate the backup on the first save, then at most every N
+# saves or interval seconds, whichever comes first. Forced (compliance)
+# saves always rotate it.
+BACKUP_EVERY_SAVES = 50
+BACKUP_MIN_INTERVAL_SECONDS = 60
+
+# Durability levels for save(): 'none' leaves data in the page cache, 'data'
+# fsyncs the state file, 'full' also fsyncs its directory (the rename)
+Durability = Literal['none', 'data', 'full']
+_DURABILITY_RANK = {'none': 0, 'data': 1, 'full': 2}
+
+# Live managers with possibly unflushed state (flushed at exit / SIGTERM)
+_live_managers = weakref.WeakSet()
+_shutdown_hooks_installed = False
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _encode_dt(obj):
+    """JSON default hook: dates as ISO strings, dataclasses as dicts, numpy
+    scalars/arrays as plain numbers/lists.
+
+    orjson handles all of these natively, so it only reaches here for stray
+    types; anything else still falls back to str() as before.
+    """
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    if type(obj).__module__ == 'numpy':
+        # Matches orjson's OPT_SERIALIZE_NUMPY instead of quoting the value
+        return obj.tolist()
+    return str(obj)
+
+
+def _dumps_state(state: Dict) -> bytes:
+    """Serialize state to compact JSON bytes in one call (orjson when available).
+
+    Used for the state and dashboard files, which are machine-read only;
+    print_status is the human view.
+    """
+    if orjson is not None:
+        return orjson.dumps(state, default=_encode_dt, option=_ORJSON_OPTIONS)
+    return json.dumps(state, separators=(',', ':'), default=_encode_dt).encode('utf-8')
+
+
+def _append_ndjson(path: str, records: List[Dict], durable: bool = False):
+    """Append records to an NDJSON file as one line each, in one write.
+
+    With durable=True the append is fsynced before returning.
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+        payload = b''.join(orjson.dumps(r, default=_encode_dt, option=option) for r in records)
+    else:
+        payload = ''.join(json.dumps(r, default=_encode_dt) + '\n' for r in records).encode('utf-8')
+    with open(path, 'ab') as f:
+        f.write(payload)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _iter_ndjson(path: str) -> Iterator[Dict]:
+    """Stream records from an NDJSON file, skipping blank or torn lines."""
+    if not os.path.exists(path):
+        return
+
+    loads = orjson.loads if orjson is not None else json.loads
+    with open(path, 'rb') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield loads(line)
+            except ValueError:
+                logger.warning(f"Skipping unreadable line {line_no} in {path}")
+
+
 # Ensure state directory exists
 os.makedirs(os.path.dirname(DASHBOARD_STATE_FILE), exist_ok=True)
 
 
-@dataclass
+def _flush_all_managers():
+    """Flush every live StateManager. Registered with atexit."""
+    for manager in list(_live_managers):
+        try:
+            manager.flush()
+        except Exception as e:
+            logger.error(f"Error flushing state on shutdown: {e}")
+        manager.flush_dashboard()
+
+
+def _handle_sigterm(signum, frame):
+    """Turn SIGTERM into a normal exit so atexit flushes pending state."""
+    raise SystemExit(128 + signum)
+
+
+def _install_shutdown_hooks():
+    """Register the exit-time flush once per process.
+
+    The SIGTERM handler is only installed from the main thread and only if
+    nobody else has claimed the signal.
+    """
+    global _shutdown_hooks_installed
+    if _shutdown_hooks_installed:
+        return
+    _shutdown_hooks_installed = True
+    atexit.register(_flush_all_managers)
+    if threading.current_thread() is threading.main_thread():
+        try:
+            if signal.getsignal(signal.SIGTERM) in (signal.SIG_DFL, None):
+                signal.signal(signal.SIGTERM, _handle_sigterm)
+        except (ValueError, OSError):
+            pass
+
+
+@dataclass(slots=True)
 class Position:
     """Represents a portfolio position"""
     ticker: str
@@ -50,7 +195,7 @@ class Position:
     pnl_pct: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     """Represents a completed trade"""
     timestamp: str
@@ -67,24 +212,80 @@ class StateManager:
 
     def __init__(self, state_file: str = STATE_FILE):
         self.state_file = state_file
+        base = os.path.splitext(state_file)[0]
+        self.trade_log_file = base + '_trades.ndjson'
+        self.daily_values_file = base + '_daily.ndjson'
         self.state = self._load_state()
+        self._positions: Dict[str, Dict] = self.state.setdefault('positions', {})
+        # save() batching (see save / defer_save)
+        self._defer_depth = 0
+        self._dirty = threading.Event()
+        self._pending_durability: Durability = 'none'
+        # Background writer, only alive while state is dirty (see _flush_loop)
+        self._flusher = None
+        self._flusher_lock = threading.Lock()
+        self._last_saved_hash: Optional[bytes] = None
+        self._saves_since_backup = 0
+        self._last_backup: Optional[float] = None  # time.monotonic()
+        # Bumped on every mutation (see _mark_dirty); keys derived caches
+        self._state_version = 0
+        self._positions_list_cache: Tuple[int, List[Dict]] = (-1, [])
+        # Latest dashboard snapshot awaiting the dashboard-writer thread
+        self._dashboard_pending: Optional[Dict] = None
+        self._dashboard_writer = None
+        self._dashboard_writer_lock = threading.Lock()
+        self._dashboard_io_lock = threading.Lock()
+        _live_managers.add(self)
+        _install_shutdown_hooks()
+        # Append-only history, kept out of the state file
+        self._trade_log: Deque[Dict] = deque(
+            self._load_history('trade_log', self.trade_log_file), maxlen=TRADE_LOG_MAX)
+        # Daily values are only read for reporting: load on first use
+        self._migrate_history('daily_values', self.daily_values_file)
+        self._daily_values: Optional[List[Dict]] = None
+        # Today's trades and their (ticker, action, shares) -> prices index,
+        # rebuilt on date rollover (see _todays_trades)
+        self._today_trades_date: Optional[str] = None
+        self._today_trades: List[Dict] = []
+        self._today_orders: Dict[Tuple, List[float]] = {}
+        self._today_cache: Tuple[int, str] = (-1, '')
+        # Parsed lot buy timestamps (see _lot_dt)
+        self._lot_dt_cache: Dict[str, Optional[datetime]] = {}
+        # ticker -> buy_ts_utc of its youngest lot (see _youngest_lot_dt)
+        self._youngest_buy: Dict[str, str] = {}
         # Migrate positions to include timestamps (one-time migration)
         self._migrate_position_timestamps()
         # Validate HOLD_MODE consistency (FIX: prevent mode/lot mismatch)
         self._validate_hold_mode_consistency()
+        # Min-heap of (buy_epoch, ticker, lot_id) across all positions, with
+        # lazy deletion (see next_global_eligible_time)
+        self._buy_heap: List[Tuple[float, str, str]] = []
+        for ticker, pos in self._positions.items():
+            # Drop the memo older versions persisted inside the position
+            pos.pop('_youngest_buy_ts', None)
+            for lot in self._lot_map(pos).values():
+                buy_epoch = self._lot_epoch(lot)
+                if buy_epoch is not None:
+                    self._buy_heap.append((buy_epoch, ticker, lot.get('lot_id', '')))
+        heapq.heapify(self._buy_heap)
 
     def _load_state(self) -> Dict:
         """Load state from disk or initialize fresh state.
 
-        Thread-safe: Uses file locking for consistent reads.
+        Thread-safe: Uses file locking for consistent reads. Pending writes
+        from other managers on the same file are flushed first.
         """
+        for other in list(_live_managers):
+            if other.state_file == self.state_file:
+                other.flush()
+
         with _state_file_lock:
             try:
                 if os.path.exists(self.state_file):
                     with open(self.state_file, 'r') as f:
                         state = json.load(f)
                     logger.info(f"Loaded state from {self.state_file}")
-                    return state
+                    return self._strip_derived_fields(state)
                 else:
                     logger.info("No existing state file, initializing fresh state")
                     return self._initialize_state()
@@ -95,13 +296,65 @@ class StateManager:
                     logger.info("Attempting to load from backup...")
                     try:
                         with open(STATE_BACKUP_FILE, 'r') as f:
-                            return json.load(f)
+                            return self._strip_derived_fields(json.load(f))
                     except (json.JSONDecodeError, IOError) as backup_error:
                         logger.critical(f"BOTH state files corrupted: primary={e}, backup={backup_error}")
                         logger.critical("INITIALIZING FRESH STATE - position data will be lost!")
 
                 return self._initialize_state()
 
+    @staticmethod
+    def _strip_derived_fields(state: Dict) -> Dict:
+        """Drop fields older state files persisted but are now computed."""
+        state.pop('trades_remaining', None)  # see get_trades_remaining()
+        return state
+
+    def _load_history(self, key: str, path: str) -> Iterator[Dict]:
+        """Stream an append-only history list from its NDJSON sidecar."""
+        self._migrate_history(key, path)
+        return _iter_ndjson(path)
+
+    def _migrate_history(self, key: str, path: str):
+        """
+        State files written before the sidecar split carry the list inline
+        under `key`; it is moved to the sidecar and dropped from the state.
+        If the sidecar already exists (e.g. state restored from a
+        pre-migration backup), only entries newer than its tail are appended.
+        """
+        legacy = self.state.pop(key, None)
+        if legacy is None:
+            return
+        if legacy:
+            if not os.path.exists(path):
+                _append_ndjson(path, legacy)
+                logger.info(f"Moved {len(legacy)} {key} entries to {path}")
+            else:
+                missing = self._entries_after_tail(legacy, path)
+                if missing:
+                    _append_ndjson(path, missing)
+                    logger.warning(f"Recovered {len(missing)} inline {key} entries missing from {path}")
+        self._mark_dirty()
+
+    @staticmethod
+    def _entries_after_tail(legacy: List[Dict], path: str) -> List[Dict]:
+        """Inline history entries not yet mirrored to the sidecar at `path`."""
+        tail = deque(_iter_ndjson(path), maxlen=1)
+        if not tail:
+            return list(legacy)
+        tail = tail[0]
+
+        # Common case: the sidecar continues the inline list
+        for i in range(len(legacy) - 1, -1, -1):
+            if legacy[i] == tail:
+                return legacy[i + 1:]
+
+        # Otherwise order by the record's own time field
+        field = next((f for f in ('timestamp', 'date') if f in tail), None)
+        if field is None:
+            logger.warning(f"Dropping {len(legacy)} inline entries: cannot order them against {path}")
+            return []
+        return [entry for entry in legacy if str(entry.get(field, '')) > str(tail[field])]
+
     def _initialize_state(self) -> Dict:
         """Create fresh state for new bot instance"""
         return {
@@ -113,7 +366,6 @@ class StateManager:
 
             # Trade tracking
             'trades_used': 0,
-            'trades_remaining': MAX_TRADES_TOTAL,
 
             # Weekly tracking
             'week_replacements': 0,
@@ -122,12 +374,6 @@ class StateManager:
             # Positions
             'positions': {},
 
-            # Transaction log
-            'trade_log': [],
-
-            # Daily portfolio values
-            'daily_values': [],
-
             # Execution tracking
             'last_execution_date': None,
             'last_execution_time': None,
@@ -170,7 +416,8 @@ class StateManager:
             return None
 
         # Handle trailing Z (e.g., 2026-01-20T14:30:00Z)
-        ts = ts.replace("Z", "+00:00")
+        if ts.endswith("Z"):
+            ts = ts[:-1] + "+00:00"
 
         try:
             dt = datetime.fromisoformat(ts)
@@ -179,11 +426,73 @@ class StateManager:
 
         # If naive, assume local system timezone (safe for historical logs)
         if dt.tzinfo is None:
-            local_tz = datetime.now().astimezone().tzinfo
-            dt = dt.replace(tzinfo=local_tz)
+            dt = dt.replace(tzinfo=_LOCAL_TZ)
 
         return dt.astimezone(timezone.utc)
 
+    def _lot_dt(self, lot: Dict) -> Optional[datetime]:
+        """
+        Parsed buy_ts_utc of a lot, memoized.
+
+        Keyed by the timestamp string rather than lot_id: migrated lot IDs
+        ('MIGRATED', 'MIG_1', ...) repeat across tickers, and the parse only
+        depends on the string, so entries never go stale.
+        """
+        return self._ts_dt(lot.get('buy_ts_utc', ''))
+
+    def _lot_epoch(self, lot: Dict) -> Optional[float]:
+        """
+        Buy time of a lot as a POSIX timestamp.
+
+        Lots carry buy_ts_epoch (written at creation, backfilled by the
+        migration); only lots without it fall back to parsing buy_ts_utc.
+        """
+        buy_epoch = lot.get('buy_ts_epoch')
+        if buy_epoch is not None:
+            return buy_epoch
+        buy_ts = self._lot_dt(lot)
+        return buy_ts.timestamp() if buy_ts else None
+
+    @staticmethod
+    def _to_epoch(buy_ts: datetime) -> int:
+        """Whole-second epoch for buy_ts_epoch, rounded up so a lot never
+        looks older than it is (fail-closed for the hold check)."""
+        return math.ceil(buy_ts.timestamp())
+
+    @staticmethod
+    def _epoch_iso(epoch: float) -> str:
+        """Format a POSIX timestamp as ISO UTC with Z suffix."""
+        return datetime.fromtimestamp(epoch, timezone.utc).isoformat().replace('+00:00', 'Z')
+
+    def _today_iso(self) -> str:
+        """Local date as YYYY-MM-DD, recomputed at most once per second."""
+        second = int(time.time())
+        if self._today_cache[0] != second:
+            self._today_cache = (second, date.fromtimestamp(second).isoformat())
+        return self._today_cache[1]
+
+    def _new_lot(self, qty: int, ts_utc: str, price: float = None) -> Dict:
+        """Build a lot dict for a BUY at ts_utc."""
+        lot = {
+            'lot_id': self._generate_lot_id(),
+            'qty': qty,
+            'buy_ts_utc': ts_utc,
+        }
+        buy_ts = self._lot_dt(lot)
+        if buy_ts is not None:
+            lot['buy_ts_epoch'] = self._to_epoch(buy_ts)
+        if price is not None:
+            lot['buy_price'] = price
+        return lot
+
+    def _ts_dt(self, ts: str) -> Optional[datetime]:
+        """Memoized _parse_timestamp_utc for lot buy timestamps."""
+        try:
+            return self._lot_dt_cache[ts]
+        except KeyError:
+            buy_ts = self._lot_dt_cache[ts] = self._parse_timestamp_utc(ts)
+            return buy_ts
+
     def _migrate_position_timestamps(self):
         """
         Migrate existing positions to include timestamp-based holding period fields
@@ -198,18 +507,16 @@ class StateManager:
         Called automatically in __init__.
         """
         changed = False
-        trade_log = self.state.get('trade_log', [])
+        trade_log = self._trade_log
+        now_iso = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
 
         # Build lookup of BUY transactions per ticker from trade_log
-        buys_by_ticker = {}
+        buys_by_ticker = defaultdict(list)
         for tr in trade_log:
             if tr.get('action') == 'BUY' and tr.get('ticker'):
-                ticker = tr['ticker']
-                if ticker not in buys_by_ticker:
-                    buys_by_ticker[ticker] = []
-                buys_by_ticker[ticker].append(tr)
+                buys_by_ticker[tr['ticker']].append(tr)
 
-        positions = self.state.get('positions', {})
+        positions = self._positions
         for ticker, pos in positions.items():
             # 1. Migrate last_buy_timestamp if missing (legacy support)
             if 'last_buy_timestamp' not in pos or not pos.get('last_buy_timestamp'):
@@ -221,7 +528,7 @@ class StateManager:
                     logger.info(f"Migrated {ticker}: last_buy_timestamp from trade_log")
                 else:
                     # Fail-safe: if we truly don't know, set to NOW so we DON'T violate 24h
-                    pos['last_buy_timestamp'] = datetime.now(timezone.utc).isoformat()
+                    pos['last_buy_timestamp'] = now_iso
                     pos['last_buy_timestamp_inferred'] = True
                     logger.warning(f"Migrated {ticker}: last_buy_timestamp inferred (set to now for safety)")
                 changed = True
@@ -260,14 +567,16 @@ class StateManager:
                             lots.append(lot)
 
                     # Verify total matches position shares
-                    lot_total = sum(lot.get('qty', 0) for lot in lots)
+                    lot_total = 0
+                    for lot in lots:
+                        lot_total += lot['qty']
 
                     if lots and abs(lot_total - shares) < shares * 0.1:  # Within 10%
                         # Adjust last lot to match position shares exactly
                         if lot_total != shares and lots:
                             diff = shares - lot_total
                             lots[-1]['qty'] += diff
-                        pos['lots'] = lots
+                        pos['lots'] = {lot['lot_id']: lot for lot in lots}
                         logger.info(f"Migrated {ticker}: {len(lots)} lots from trade_log")
                     else:
                         # Create synthetic lot using entry_date if available
@@ -286,19 +595,19 @@ class StateManager:
                                 )
                             except Exception as e:
                                 # Fallback to NOW if entry_date unparseable
-                                synthetic_ts = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+                                synthetic_ts = now_iso
                                 logger.warning(f"Could not parse entry_date for {ticker}: {e}, using NOW")
                         else:
                             # No entry_date - conservative fallback to NOW (blocks sells for 24h)
-                            synthetic_ts = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+                            synthetic_ts = now_iso
                             logger.warning(f"Migrated {ticker}: no entry_date, using NOW (conservative)")
 
-                        pos['lots'] = [{
+                        pos['lots'] = {'MIGRATED': {
                             'lot_id': 'MIGRATED',
                             'qty': shares,
                             'buy_ts_utc': synthetic_ts,
                             'synthetic': True
-                        }]
+                        }}
                         logger.warning(
                             f"Migrated {ticker}: synthetic lot created. "
                             f"Trade log total: {lot_total}, position shares: {shares}"
@@ -315,24 +624,32 @@ class StateManager:
                             synthetic_ts = (entry_dt + timedelta(hours=25)).isoformat().replace('+00:00', 'Z')
                             logger.info(f"Migrated {ticker}: using entry_date + 25h = {synthetic_ts}")
                         except Exception as e:
-                            synthetic_ts = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+                            synthetic_ts = now_iso
                             logger.warning(f"Could not parse entry_date for {ticker}: {e}, using NOW")
                     else:
-                        synthetic_ts = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+                        synthetic_ts = now_iso
                         logger.warning(f"No entry_date for {ticker}, using NOW (conservative)")
 
-                    pos['lots'] = [{
+                    pos['lots'] = {'MIGRATED': {
                         'lot_id': 'MIGRATED',
                         'qty': shares,
                         'buy_ts_utc': synthetic_ts,
                         'synthetic': True
-                    }]
+                    }}
                     logger.warning(f"Migrated {ticker}: synthetic lot created (no trade_log entries)")
 
                 changed = True
 
+            # 4. Backfill buy_ts_epoch so hold checks skip timestamp parsing
+            for lot in self._lot_map(pos).values():
+                if 'buy_ts_epoch' not in lot:
+                    buy_ts = self._lot_dt(lot)
+                    if buy_ts is not None:
+                        lot['buy_ts_epoch'] = self._to_epoch(buy_ts)
+                        changed = True
+
         if changed:
-            self.save()
+            self._mark_dirty()
             logger.info("Position timestamp and lot migration complete")
 
     def _validate_hold_mode_consistency(self):
@@ -349,7 +666,7 @@ class StateManager:
         """
         from config import HOLD_MODE
 
-        positions = self.state.get('positions', {})
+        positions = self._positions
         if not positions:
             return  # Nothing to validate
 
@@ -383,37 +700,189 @@ class StateManager:
         if not multi_lot_tickers and not no_lot_tickers:
             logger.debug(f"HOLD_MODE consistency check passed: {HOLD_MODE}")
 
-    def save(self):
-        """Save current state to disk with backup.
+    @contextmanager
+    def defer_save(self):
+        """Batch save() calls: inside the block saves only mark state dirty,
+        and a single save happens when the outermost block exits.
+        save(force=True) is a compliance checkpoint and still writes through
+        immediately inside the block.
 
-        Thread-safe: Uses file locking to prevent concurrent write corruption.
+        The flush also runs if the block raises, so completed trades are
+        still persisted.
         """
-        with _state_file_lock:
+        self._defer_depth += 1
+        try:
+            yield self
+        finally:
+            self._defer_depth -= 1
+            if self._defer_depth == 0 and self._dirty.is_set():
+                self._mark_dirty()
+
+    def save(self, force: bool = False, durability: Durability = 'data'):
+        """Persist state.
+
+        By default this only marks state dirty; a background thread writes it
+        once mutations stop arriving for SAVE_DEBOUNCE_SECONDS, so a burst of
+        updates costs one disk write. force=True writes synchronously, even
+        inside defer_save(). Pending state is also flushed at exit and on
+        SIGTERM.
+
+        durability picks how far the write is pushed before returning:
+        'none' (no fsync), 'data' (fsync the file) or 'full' (also fsync the
+        directory so the rename itself survives a crash). Coalesced saves use
+        the strongest level requested since the last write.
+        """
+        self._mark_dirty(durability)
+        if force:
+            with _state_file_lock:
+                self._flush_locked(backup=True)
+
+    def _mark_dirty(self, durability: Durability = 'data'):
+        """Flag state as changed and make sure the flusher is running."""
+        self._state_version += 1
+        if _DURABILITY_RANK[durability] > _DURABILITY_RANK[self._pending_durability]:
+            self._pending_durability = durability
+        self._dirty.set()
+        if self._defer_depth:
+            # defer_save() re-marks on exit, which starts the flusher then
+            return
+        with self._flusher_lock:
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name='state-flusher', daemon=True
+                )
+                self._flusher.start()
+
+    def _flush_loop(self):
+        """Background writer: coalesce dirty marks into one write.
+
+        Exits as soon as state is clean or a defer_save() block is open, so
+        an idle manager pins no thread and can be garbage collected; the
+        next _mark_dirty starts a fresh one.
+        """
+        while True:
+            # Let the rest of the burst land before writing
+            time.sleep(SAVE_DEBOUNCE_SECONDS)
+            with self._flusher_lock:
+                if self._defer_depth or not self._dirty.is_set():
+                    self._flusher = None
+                    return
             try:
-                # Create backup of existing state
-                if os.path.exists(self.state_file):
-                    shutil.copy(self.state_file, STATE_BACKUP_FILE)
+                self.flush()
+            except (IOError, RuntimeError) as e:
+                # RuntimeError: state mutated mid-dump; retry next round
+                logger.warning(f"Background state flush failed: {e}")
 
-                # Update timestamp
-                self.state['last_updated'] = datetime.now().isoformat()
+    def flush(self):
+        """Write pending state to disk now (no-op if nothing changed).
 
-                # Write new state atomically (write to temp, then rename)
-                temp_file = self.state_file + '.tmp'
-                with open(temp_file, 'w') as f:
-                    json.dump(self.state, f, indent=2, default=str)
+        Thread-safe: Uses file locking to prevent concurrent write corruption.
+        """
+        with _state_file_lock:
+            self._flush_locked()
 
-                # Atomic rename (on POSIX systems)
-                os.replace(temp_file, self.state_file)
+    def _flush_locked(self, backup: bool = False):
+        """flush() body. Caller holds _state_file_lock.
 
-                logger.debug(f"State saved to {self.state_file}")
+        backup=True rotates the backup regardless of the throttle.
+        """
+        if not self._dirty.is_set():
+            return
+        durability = self._pending_durability
+        self._pending_durability = 'none'
+        self._dirty.clear()
+        try:
+            self._flush_to_disk(durability, backup)
+        except BaseException:
+            self._mark_dirty(durability)
+            raise
 
-            except IOError as e:
-                logger.error(f"Error saving state: {e}")
-                # Clean up temp file if it exists
-                temp_file = self.state_file + '.tmp'
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-                raise
+    def _flush_to_disk(self, durability: Durability = 'data', backup: bool = False):
+        """Save current state to disk with backup. Caller holds the lock."""
+        try:
+            # Encode once, without the timestamp, and skip the write entirely
+            # if nothing but the timestamp changed
+            last_updated = self.state.pop('last_updated', None)
+            try:
+                body = _dumps_state(self.state)
+            finally:
+                self.state['last_updated'] = last_updated
+            state_hash = hashlib.blake2b(body, digest_size=16).digest()
+            if state_hash == self._last_saved_hash:
+                logger.debug(f"State unchanged, skipped write to {self.state_file}")
+                return
+
+            # Update timestamp and splice it into the encoded object
+            last_updated = self.state['last_updated'] = datetime.now().isoformat()
+            stamp = b'{"last_updated":"' + last_updated.encode('ascii') + b'"'
+            payload = stamp + (b',' + body[1:] if body != b'{}' else b'}')
+
+            # Write new state atomically (write to temp, then rename)
+            temp_file = self.state_file + '.tmp'
+            with open(temp_file, 'wb') as f:
+                f.write(payload)
+                if durability != 'none':
+                    # Make sure the data is on disk before the rename exposes it
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            # Keep the previous state as the backup (throttled unless forced)
+            if (backup or self._backup_due()) and os.path.exists(self.state_file):
+                self._rotate_backup()
+                self._saves_since_backup = 0
+                self._last_backup = time.monotonic()
+            self._saves_since_backup += 1
+
+            # Atomic rename (on POSIX systems)
+            os.replace(temp_file, self.state_file)
+            if durability == 'full':
+                self._fsync_state_dir()
+            self._last_saved_hash = state_hash
+
+            logger.debug(f"State saved to {self.state_file}")
+
+        except IOError as e:
+            logger.error(f"Error saving state: {e}")
+            # Clean up temp file if it exists
+            temp_file = self.state_file + '.tmp'
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
+
+    def _fsync_state_dir(self):
+        """fsync the state file's directory so the rename is durable.
+
+        Directories cannot be opened for fsync on Windows; skipped there.
+        """
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        dir_fd = os.open(os.path.dirname(os.path.abspath(self.state_file)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    def _backup_due(self) -> bool:
+        """Whether this write should rotate the backup (see BACKUP_EVERY_SAVES)."""
+        return (self._last_backup is None
+                or self._saves_since_backup >= BACKUP_EVERY_SAVES
+                or time.monotonic() - self._last_backup >= BACKUP_MIN_INTERVAL_SECONDS)
+
+    def _rotate_backup(self):
+        """Point the backup at the current state file without copying it.
+
+        Hard-links the old file under a temp name and renames that over the
+        backup, so the state file itself never goes missing. Falls back to a
+        copy where hard links are unsupported (e.g. across filesystems).
+        """
+        backup_tmp = STATE_BACKUP_FILE + '.tmp'
+        try:
+            if os.path.exists(backup_tmp):
+                os.remove(backup_tmp)
+            os.link(self.state_file, backup_tmp)
+            os.replace(backup_tmp, STATE_BACKUP_FILE)
+        except OSError:
+            shutil.copy(self.state_file, STATE_BACKUP_FILE)
 
     def get_trades_used(self) -> int:
         """Get number of trades used"""
@@ -426,8 +895,9 @@ class StateManager:
     def increment_trade_count(self, count: int = 1):
         """Increment trade counter"""
         self.state['trades_used'] += count
-        self.state['trades_remaining'] = MAX_TRADES_TOTAL - self.state['trades_used']
-        self.save()
+        # Compliance checkpoint: the trade cap must never be under-counted
+        # because a crash landed inside the debounce window.
+        self.save(force=True)
 
     def get_week_replacements(self) -> int:
         """Get number of satellite replacements this week"""
@@ -436,18 +906,18 @@ class StateManager:
     def increment_week_replacements(self, count: int = 1):
         """Increment weekly replacement counter"""
         self.state['week_replacements'] += count
-        self.save()
+        self._mark_dirty()
 
     def reset_weekly_counters(self):
         """Reset weekly counters (called on Fridays)"""
         self.state['week_replacements'] = 0
-        self.state['week_start_date'] = datetime.now().date().isoformat()
-        self.save()
+        self.state['week_start_date'] = self._today_iso()
+        self._mark_dirty()
         logger.info("Weekly counters reset")
 
     def get_positions(self) -> Dict[str, Dict]:
         """Get all current positions"""
-        return self.state.get('positions', {})
+        return self._positions
 
     def add_position(self, ticker: str, shares: int, price: float,
                      entry_date: str = None, bucket: str = None):
@@ -462,24 +932,15 @@ class StateManager:
         """
         now_utc = self._utc_now_iso()
         if entry_date is None:
-            entry_date = datetime.now().date().isoformat()
+            entry_date = self._today_iso()
 
-        if ticker in self.state['positions']:
+        if ticker in self._positions:
             # Update existing position - use add_buy_lot for proper lot tracking
-            existing = self.state['positions'][ticker]
+            existing = self._positions[ticker]
 
             # Create new lot
-            lot = {
-                'lot_id': self._generate_lot_id(),
-                'qty': shares,
-                'buy_ts_utc': now_utc,
-            }
-            if price is not None:
-                lot['buy_price'] = price
-
-            if 'lots' not in existing:
-                existing['lots'] = []
-            existing['lots'].append(lot)
+            lot = self._new_lot(shares, now_utc, price)
+            self._lot_map(existing)[lot['lot_id']] = lot
 
             # Update average cost
             old_shares = existing.get('shares', 0)
@@ -499,17 +960,11 @@ class StateManager:
                 existing['bucket'] = bucket
         else:
             # New position with first lot
-            lot = {
-                'lot_id': self._generate_lot_id(),
-                'qty': shares,
-                'buy_ts_utc': now_utc,
-            }
-            if price is not None:
-                lot['buy_price'] = price
+            lot = self._new_lot(shares, now_utc, price)
 
-            self.state['positions'][ticker] = {
+            self._positions[ticker] = {
                 'ticker': ticker,
-                'lots': [lot],
+                'lots': {lot['lot_id']: lot},
                 'shares': shares,
                 'entry_price': price,
                 'entry_date': entry_date,
@@ -518,31 +973,32 @@ class StateManager:
                 'bucket': bucket,
             }
 
-        self.save()
+        self._push_buy(ticker, lot)
+        self._mark_dirty()
         logger.info(f"Position added/updated: {ticker} - {shares} shares, lot created at {now_utc}")
 
     def remove_position(self, ticker: str):
         """Remove a position (after selling)"""
-        if ticker in self.state['positions']:
-            del self.state['positions'][ticker]
-            self.save()
+        if ticker in self._positions:
+            self._drop_position(ticker)
+            self._mark_dirty()
             logger.info(f"Position removed: {ticker}")
 
     def update_position_shares(self, ticker: str, new_shares: int):
         """Update shares for a position (partial sell)"""
-        if ticker in self.state['positions']:
+        if ticker in self._positions:
             if new_shares <= 0:
                 self.remove_position(ticker)
             else:
-                self.state['positions'][ticker]['shares'] = new_shares
-                self.save()
+                self._positions[ticker]['shares'] = new_shares
+                self._mark_dirty()
 
     # =========================================================================
     # LOT-BASED POSITION TRACKING (24-HOUR HOLD COMPLIANCE)
     # =========================================================================
     def _generate_lot_id(self) -> str:
-        """Generate a short unique lot ID."""
-        return str(uuid.uuid4())[:8]
+        """Generate a short unique lot ID (8 hex chars)."""
+        return secrets.token_hex(4)
 
     def _utc_now_iso(self) -> str:
         """Get current UTC time in ISO format with Z suffix."""
@@ -558,13 +1014,13 @@ class StateManager:
         Returns:
             Total shares held across all lots
         """
-        pos = self.state.get('positions', {}).get(ticker)
+        pos = self._positions.get(ticker)
         if not pos:
             return 0
 
-        lots = pos.get('lots', [])
+        lots = self._lot_map(pos)
         if lots:
-            return sum(lot.get('qty', 0) for lot in lots)
+            return sum(lot.get('qty', 0) for lot in lots.values())
 
         # Fallback to legacy shares field if no lots
         return pos.get('shares', 0)
@@ -586,50 +1042,44 @@ class StateManager:
         if ts_utc is None:
             ts_utc = self._utc_now_iso()
 
-        lot = {
-            'lot_id': self._generate_lot_id(),
-            'qty': qty,
-            'buy_ts_utc': ts_utc,
-        }
-        if price is not None:
-            lot['buy_price'] = price
+        lot = self._new_lot(qty, ts_utc, price)
 
-        if ticker not in self.state['positions']:
+        if ticker not in self._positions:
             # New position
-            self.state['positions'][ticker] = {
+            self._positions[ticker] = {
                 'ticker': ticker,
-                'lots': [lot],
+                'lots': {lot['lot_id']: lot},
                 'shares': qty,  # Keep legacy field in sync
                 'entry_price': price or 0,
-                'entry_date': datetime.now().date().isoformat(),
+                'entry_date': self._today_iso(),
                 'entry_timestamp': ts_utc,
                 'last_buy_timestamp': ts_utc,
                 'bucket': bucket,
             }
         else:
             # Add to existing position
-            pos = self.state['positions'][ticker]
-            if 'lots' not in pos:
-                pos['lots'] = []
-            pos['lots'].append(lot)
+            pos = self._positions[ticker]
+            old_shares = pos.get('shares', 0)
+            new_shares = old_shares + qty
+            self._lot_map(pos)[lot['lot_id']] = lot
 
-            # Update derived fields
-            pos['shares'] = self.get_total_shares(ticker)
+            # Update derived fields (shares kept in sync incrementally)
+            pos['shares'] = new_shares
             pos['last_buy_timestamp'] = ts_utc
 
             # Update average cost if price provided
             if price is not None:
-                old_shares = pos.get('shares', 0) - qty
                 old_cost = pos.get('entry_price', 0)
                 if old_shares > 0 and old_cost > 0:
-                    pos['entry_price'] = ((old_shares * old_cost) + (qty * price)) / pos['shares']
+                    pos['entry_price'] = ((old_shares * old_cost) + (qty * price)) / new_shares
                 else:
                     pos['entry_price'] = price
 
             if bucket and not pos.get('bucket'):
                 pos['bucket'] = bucket
 
-        self.save()
+        self._push_buy(ticker, lot)
+        self._mark_dirty()
         logger.info(f"Added buy lot for {ticker}: {qty} shares at {ts_utc}")
 
     def eligible_sell_qty(self, ticker: str, now_utc: datetime = None) -> int:
@@ -645,16 +1095,14 @@ class StateManager:
         Returns:
             Number of shares eligible to sell
         """
-        from config import MIN_HOLD_SECONDS, HOLD_BUFFER_SECONDS
-
         if now_utc is None:
             now_utc = datetime.now(timezone.utc)
 
-        pos = self.state.get('positions', {}).get(ticker)
+        pos = self._positions.get(ticker)
         if not pos:
             return 0
 
-        lots = pos.get('lots', [])
+        lots = self._lot_map(pos)
         if not lots:
             # Legacy position without lots - use last_buy_timestamp
             ts_str = pos.get('last_buy_timestamp') or pos.get('entry_timestamp')
@@ -665,25 +1113,82 @@ class StateManager:
             if not buy_ts:
                 return 0
 
-            required_hold = MIN_HOLD_SECONDS + HOLD_BUFFER_SECONDS
+            required_hold = _REQUIRED_HOLD
             if (now_utc - buy_ts).total_seconds() >= required_hold:
                 return pos.get('shares', 0)
             return 0
 
         # Sum eligible lots
-        required_hold = MIN_HOLD_SECONDS + HOLD_BUFFER_SECONDS
+        cutoff = now_utc.timestamp() - _REQUIRED_HOLD
         eligible = 0
 
-        for lot in lots:
-            buy_ts = self._parse_timestamp_utc(lot.get('buy_ts_utc', ''))
-            if not buy_ts:
+        for lot in lots.values():
+            buy_epoch = self._lot_epoch(lot)
+            if buy_epoch is None:
                 continue  # Skip lots without valid timestamps
 
-            if (now_utc - buy_ts).total_seconds() >= required_hold:
+            if buy_epoch <= cutoff:
                 eligible += lot.get('qty', 0)
 
         return eligible
 
+    def eligible_sell_qty_bulk(self, tickers: Iterable[str],
+                               now_utc: datetime = None) -> Dict[str, Tuple[int, Optional[str]]]:
+        """
+        eligible_sell_qty and earliest_eligible_time for many tickers at once.
+
+        Walks the held positions once with a single now_utc, so a scheduler
+        asking "what can I sell now?" doesn't pay a method call and clock
+        read per ticker per question.
+
+        Args:
+            tickers: Stock ticker symbols to check
+            now_utc: Current UTC time (defaults to now)
+
+        Returns:
+            {ticker: (eligible_qty, earliest ISO eligible time or None)};
+            tickers not held map to (0, None)
+        """
+        if now_utc is None:
+            now_utc = datetime.now(timezone.utc)
+
+        wanted = tickers if isinstance(tickers, (set, frozenset)) else set(tickers)
+        cutoff = now_utc.timestamp() - _REQUIRED_HOLD
+        result = {}
+
+        for ticker, pos in self._positions.items():
+            if ticker not in wanted:
+                continue
+
+            lots = self._lot_map(pos)
+            if not lots:
+                # Legacy position without lots
+                result[ticker] = (
+                    self.eligible_sell_qty(ticker, now_utc),
+                    self.earliest_eligible_time(ticker, now_utc),
+                )
+                continue
+
+            eligible = 0
+            earliest = None
+            for lot in lots.values():
+                buy_epoch = self._lot_epoch(lot)
+                if buy_epoch is None:
+                    continue
+                if buy_epoch <= cutoff:
+                    eligible += lot.get('qty', 0)
+                elif earliest is None or buy_epoch < earliest:
+                    earliest = buy_epoch
+
+            result[ticker] = (
+                eligible,
+                self._epoch_iso(earliest + _REQUIRED_HOLD) if earliest is not None else None,
+            )
+
+        for ticker in wanted:
+            result.setdefault(ticker, (0, None))
+        return result
+
     def earliest_eligible_time(self, ticker: str, now_utc: datetime = None) -> Optional[str]:
         """
         Get the earliest time when ineligible shares become eligible.
@@ -697,16 +1202,14 @@ class StateManager:
         Returns:
             ISO timestamp of earliest eligible time, or None if all eligible/no position
         """
-        from config import MIN_HOLD_SECONDS, HOLD_BUFFER_SECONDS
-
         if now_utc is None:
             now_utc = datetime.now(timezone.utc)
 
-        pos = self.state.get('positions', {}).get(ticker)
+        pos = self._positions.get(ticker)
         if not pos:
             return None
 
-        lots = pos.get('lots', [])
+        lots = self._lot_map(pos)
         if not lots:
             # Legacy position without lots
             ts_str = pos.get('last_buy_timestamp') or pos.get('entry_timestamp')
@@ -717,7 +1220,7 @@ class StateManager:
             if not buy_ts:
                 return None
 
-            required_hold = MIN_HOLD_SECONDS + HOLD_BUFFER_SECONDS
+            required_hold = _REQUIRED_HOLD
             eligible_time = buy_ts + timedelta(seconds=required_hold)
 
             if eligible_time > now_utc:
@@ -725,23 +1228,23 @@ class StateManager:
             return None
 
         # Find earliest eligibility among ineligible lots
-        required_hold = MIN_HOLD_SECONDS + HOLD_BUFFER_SECONDS
+        now_epoch = now_utc.timestamp()
         earliest = None
 
-        for lot in lots:
-            buy_ts = self._parse_timestamp_utc(lot.get('buy_ts_utc', ''))
-            if not buy_ts:
+        for lot in lots.values():
+            buy_epoch = self._lot_epoch(lot)
+            if buy_epoch is None:
                 continue
 
-            eligible_time = buy_ts + timedelta(seconds=required_hold)
+            eligible_epoch = buy_epoch + _REQUIRED_HOLD
 
             # Only consider future eligibility times
-            if eligible_time > now_utc:
-                if earliest is None or eligible_time < earliest:
-                    earliest = eligible_time
+            if eligible_epoch > now_epoch:
+                if earliest is None or eligible_epoch < earliest:
+                    earliest = eligible_epoch
 
-        if earliest:
-            return earliest.isoformat().replace('+00:00', 'Z')
+        if earliest is not None:
+            return self._epoch_iso(earliest)
         return None
 
     def consume_sell_fifo(self, ticker: str, sell_qty: int, now_utc: datetime = None) -> bool:
@@ -762,16 +1265,14 @@ class StateManager:
         Raises:
             ValueError: If insufficient eligible shares
         """
-        from config import MIN_HOLD_SECONDS, HOLD_BUFFER_SECONDS
-
         if now_utc is None:
             now_utc = datetime.now(timezone.utc)
 
-        pos = self.state.get('positions', {}).get(ticker)
+        pos = self._positions.get(ticker)
         if not pos:
             raise ValueError(f"No position found for {ticker}")
 
-        lots = pos.get('lots', [])
+        lots = self._lot_map(pos)
         if not lots:
             # Legacy position - check if can sell all
             eligible = self.eligible_sell_qty(ticker, now_utc)
@@ -783,12 +1284,22 @@ class StateManager:
             # For legacy positions, just update shares
             pos['shares'] = pos.get('shares', 0) - sell_qty
             if pos['shares'] <= 0:
-                del self.state['positions'][ticker]
-            self.save()
+                self._drop_position(ticker)
+            self._mark_dirty()
             return True
 
-        # Check total eligible
-        eligible = self.eligible_sell_qty(ticker, now_utc)
+        # Collect eligible lots and their total in one pass; the same now_utc
+        # serves the whole sell decision
+        cutoff = now_utc.timestamp() - _REQUIRED_HOLD
+        eligible_lots = []
+        eligible = 0
+
+        for lot_id, lot in lots.items():
+            buy_epoch = self._lot_epoch(lot)
+            if buy_epoch is not None and buy_epoch <= cutoff:
+                eligible_lots.append((buy_epoch, lot_id))
+                eligible += lot.get('qty', 0)
+
         if eligible < sell_qty:
             earliest = self.earliest_eligible_time(ticker, now_utc)
             raise ValueError(
@@ -797,52 +1308,151 @@ class StateManager:
                 f"Earliest eligible: {earliest}"
             )
 
-        # Sort lots by buy timestamp (oldest first = FIFO)
-        required_hold = MIN_HOLD_SECONDS + HOLD_BUFFER_SECONDS
-        eligible_lots = []
-
-        for i, lot in enumerate(lots):
-            buy_ts = self._parse_timestamp_utc(lot.get('buy_ts_utc', ''))
-            if buy_ts and (now_utc - buy_ts).total_seconds() >= required_hold:
-                eligible_lots.append((buy_ts, i, lot))
-
-        # Sort by timestamp (oldest first)
+        # Lots are kept in buy order; the stable sort by buy timestamp only
+        # matters if lots were inserted out of order (oldest first = FIFO)
         eligible_lots.sort(key=lambda x: x[0])
 
         # Consume FIFO
         remaining_to_sell = sell_qty
-        lots_to_remove = []
 
-        for _, idx, lot in eligible_lots:
+        for _, lot_id in eligible_lots:
             if remaining_to_sell <= 0:
                 break
 
+            lot = lots[lot_id]
             lot_qty = lot.get('qty', 0)
             if lot_qty <= remaining_to_sell:
                 # Consume entire lot
                 remaining_to_sell -= lot_qty
-                lots_to_remove.append(idx)
+                del lots[lot_id]
             else:
                 # Partial consumption
                 lot['qty'] = lot_qty - remaining_to_sell
                 remaining_to_sell = 0
 
-        # Remove fully consumed lots (in reverse order to preserve indices)
-        for idx in sorted(lots_to_remove, reverse=True):
-            lots.pop(idx)
-
         # Update derived fields
-        pos['lots'] = lots
-        pos['shares'] = sum(lot.get('qty', 0) for lot in lots)
+        pos['shares'] = sum(lot.get('qty', 0) for lot in lots.values())
 
         # Remove position if no shares remain
         if pos['shares'] <= 0:
-            del self.state['positions'][ticker]
+            self._drop_position(ticker)
 
-        self.save()
+        self._mark_dirty()
         logger.info(f"Consumed {sell_qty} shares from {ticker} (FIFO), {pos.get('shares', 0)} remaining")
         return True
 
+    @staticmethod
+    def _lot_map(pos: Dict) -> Dict[str, Dict]:
+        """
+        Get a position's lots as an insertion-ordered {lot_id: lot} dict.
+
+        Lots are stored keyed by lot_id so a sell can drop a consumed lot in
+        O(1). Lot lists from older state files (or written directly by
+        tests) are converted in place; duplicate or missing IDs get a
+        positional suffix so no lot is lost.
+        """
+        lots = pos.get('lots')
+        if isinstance(lots, list):
+            lot_map = {}
+            for i, lot in enumerate(lots):
+                lot_id = lot.get('lot_id')
+                if not lot_id or lot_id in lot_map:
+                    lot_id = lot['lot_id'] = f"{lot_id or 'LOT'}_{i}"
+                lot_map[lot_id] = lot
+            lots = pos['lots'] = lot_map
+        elif lots is None:
+            lots = pos['lots'] = {}
+        return lots
+
+    def _drop_position(self, ticker: str):
+        """Delete a position along with its derived caches."""
+        del self._positions[ticker]
+        self._youngest_buy.pop(ticker, None)
+
+    def _push_buy(self, ticker: str, lot: Dict):
+        """Track a new lot in the global buy-time heap and the position's
+        cached youngest buy."""
+        pos = self._positions[ticker]
+        buy_ts = self._lot_dt(lot)
+        if buy_ts is None:
+            # Fail-closed: force has_any_recent_buy back to a full scan
+            self._youngest_buy.pop(ticker, None)
+            return
+
+        heapq.heappush(self._buy_heap, (self._lot_epoch(lot), ticker, lot['lot_id']))
+
+        youngest = self._youngest_buy.get(ticker)
+        if youngest is not None and buy_ts > (self._ts_dt(youngest) or buy_ts):
+            self._youngest_buy[ticker] = lot['buy_ts_utc']
+        elif youngest is None and len(pos['lots']) == 1:
+            self._youngest_buy[ticker] = lot['buy_ts_utc']
+
+    def _youngest_lot_dt(self, ticker: str, lots: Dict[str, Dict]) -> Optional[datetime]:
+        """
+        Get the most recent buy time among a position's lots.
+
+        Served from self._youngest_buy, which _push_buy keeps current.
+        Selling never changes it: FIFO consumes older lots first, and if the
+        youngest lot was sold then every remaining lot is older still.
+        Positions without a cached entry are scanned once and cached.
+
+        Returns:
+            datetime in UTC, or None if some lot has no valid timestamp
+        """
+        cached = self._youngest_buy.get(ticker)
+        if cached is not None:
+            return self._ts_dt(cached)
+
+        youngest = None
+        youngest_ts = None
+        for lot in lots.values():
+            buy_ts = self._lot_dt(lot)
+            if not buy_ts:
+                return None
+            if youngest is None or buy_ts > youngest:
+                youngest = buy_ts
+                youngest_ts = lot['buy_ts_utc']
+
+        self._youngest_buy[ticker] = youngest_ts
+        return youngest
+
+    def _has_lot(self, ticker: str, lot_id: str) -> bool:
+        """Check whether a lot is still held (heap entries are deleted lazily)."""
+        pos = self._positions.get(ticker)
+        if not pos:
+            return False
+        return lot_id in self._lot_map(pos)
+
+    def next_global_eligible_time(self, now_utc: datetime = None) -> Optional[Tuple[str, str]]:
+        """
+        Get the next time any held lot becomes sellable, across all positions.
+
+        Peeks the buy-time heap, discarding entries for lots that were sold or
+        have already become eligible, so schedulers can sleep until then
+        without scanning every position.
+
+        Args:
+            now_utc: Current UTC time (defaults to now)
+
+        Returns:
+            Tuple of (ticker, ISO eligible time), or None if nothing is pending
+        """
+        if now_utc is None:
+            now_utc = datetime.now(timezone.utc)
+
+        now_epoch = now_utc.timestamp()
+        heap = self._buy_heap
+
+        while heap:
+            buy_epoch, ticker, lot_id = heap[0]
+            eligible_epoch = buy_epoch + _REQUIRED_HOLD
+            if eligible_epoch <= now_epoch or not self._has_lot(ticker, lot_id):
+                heapq.heappop(heap)
+                continue
+            return ticker, self._epoch_iso(eligible_epoch)
+
+        return None
+
     def get_lots(self, ticker: str) -> List[Dict]:
         """
         Get all lots for a ticker.
@@ -851,12 +1461,12 @@ class StateManager:
             ticker: Stock ticker symbol
 
         Returns:
-            List of lot dictionaries
+            List of lot dictionaries, oldest first
         """
-        pos = self.state.get('positions', {}).get(ticker)
+        pos = self._positions.get(ticker)
         if not pos:
             return []
-        return pos.get('lots', [])
+        return list(self._lot_map(pos).values())
 
     def has_any_recent_buy(self, ticker: str, now_utc: datetime = None) -> Tuple[bool, str]:
         """
@@ -872,17 +1482,15 @@ class StateManager:
         Returns:
             Tuple of (has_recent_buy, reason_string)
         """
-        from config import MIN_HOLD_SECONDS, HOLD_BUFFER_SECONDS
-
         if now_utc is None:
             now_utc = datetime.now(timezone.utc)
 
-        pos = self.state.get('positions', {}).get(ticker)
+        pos = self._positions.get(ticker)
         if not pos:
             return False, "No position"
 
-        lots = pos.get('lots', [])
-        required_hold = MIN_HOLD_SECONDS + HOLD_BUFFER_SECONDS
+        lots = self._lot_map(pos)
+        required_hold = _REQUIRED_HOLD
 
         if not lots:
             # Legacy position - use last_buy_timestamp
@@ -900,27 +1508,25 @@ class StateManager:
                 return True, f"Last buy {remaining_hours:.1f}h ago (need 24h + buffer)"
             return False, "All buys older than 24h + buffer"
 
-        # Check all lots
-        youngest_elapsed = float('inf')
-        for lot in lots:
-            buy_ts = self._parse_timestamp_utc(lot.get('buy_ts_utc', ''))
-            if not buy_ts:
-                return True, "Lot with no timestamp (fail-closed)"
+        # Only the youngest lot matters
+        youngest = self._youngest_lot_dt(ticker, lots)
+        if not youngest:
+            return True, "Lot with no timestamp (fail-closed)"
 
-            elapsed = (now_utc - buy_ts).total_seconds()
-            youngest_elapsed = min(youngest_elapsed, elapsed)
-
-            if elapsed < required_hold:
-                remaining_hours = (required_hold - elapsed) / 3600
-                return True, f"Recent buy {remaining_hours:.1f}h ago (need 24h + buffer)"
+        elapsed = (now_utc - youngest).total_seconds()
+        if elapsed < required_hold:
+            remaining_hours = (required_hold - elapsed) / 3600
+            return True, f"Recent buy {remaining_hours:.1f}h ago (need 24h + buffer)"
 
         return False, "All lots older than 24h + buffer"
 
     def log_trade(self, ticker: str, action: str, shares: int,
                   price: float, reason: str = ''):
         """Log a completed trade with UTC timestamp for compliance."""
+        timestamp = datetime.now(timezone.utc).isoformat()  # UTC for consistency
         trade = {
-            'timestamp': datetime.now(timezone.utc).isoformat(),  # UTC for consistency
+            'timestamp': timestamp,
+            'date': timestamp[:10],  # YYYY-MM-DD, for same-day checks
             'ticker': ticker,
             'action': action,
             'shares': shares,
@@ -928,21 +1534,60 @@ class StateManager:
             'reason': reason,
             'trade_number': self.get_trades_used(),
         }
-        self.state['trade_log'].append(trade)
-        self.save()
+        self.append_trade(trade)
         logger.info(f"Trade logged: {action} {shares} {ticker} @ ${price:.2f}")
 
     def log_daily_value(self, portfolio_value: float, vix: float = None):
         """Log daily portfolio value"""
         entry = {
-            'date': datetime.now().date().isoformat(),
+            'date': self._today_iso(),
             'value': portfolio_value,
             'vix': vix,
             'positions_count': len(self.get_positions()),
             'trades_used': self.get_trades_used(),
         }
-        self.state['daily_values'].append(entry)
-        self.save()
+        self.append_daily_value(entry)
+
+    def append_trade(self, trade: Dict):
+        """Append a trade record to the trade log (one NDJSON line).
+
+        Fsynced: the trade log is the compliance record.
+        """
+        _append_ndjson(self.trade_log_file, [trade], durable=True)
+        self._trade_log.append(trade)  # bounded deque drops the oldest
+        if self._today_trades_date and self._trade_on(trade, self._today_trades_date):
+            self._index_today_trade(trade)
+
+    @staticmethod
+    def _trade_on(trade: Dict, day: str) -> bool:
+        """Whether a trade was logged on day (YYYY-MM-DD); entries logged
+        before 'date' existed are matched on their timestamp prefix."""
+        trade_date = trade.get('date')
+        if trade_date is not None:
+            return trade_date == day
+        return trade.get('timestamp', '').startswith(day)
+
+    def _index_today_trade(self, trade: Dict):
+        self._today_trades.append(trade)
+        key = (trade.get('ticker'), trade.get('action'), trade.get('shares'))
+        self._today_orders.setdefault(key, []).append(trade.get('price', 0))
+
+    def _todays_trades(self, today: str) -> List[Dict]:
+        """Trades logged today, rebuilding the index when the date rolls."""
+        if today != self._today_trades_date:
+            self._today_trades_date = today
+            self._today_trades = []
+            self._today_orders = {}
+            for trade in self._trade_log:
+                if self._trade_on(trade, today):
+                    self._index_today_trade(trade)
+        return self._today_trades
+
+    def append_daily_value(self, entry: Dict):
+        """Append a daily portfolio value record (one NDJSON line)."""
+        _append_ndjson(self.daily_values_file, [entry])
+        if self._daily_values is not None:
+            self._daily_values.append(entry)
 
     def mark_execution(self):
         """Mark that daily execution was completed"""
@@ -950,11 +1595,11 @@ class StateManager:
         self.state['last_execution_date'] = now.date().isoformat()
         self.state['last_execution_time'] = now.time().isoformat()
         self.state['execution_count'] += 1
-        self.save()
+        self.save(force=True)
 
     def already_executed_today(self) -> bool:
         """Check if we already executed today"""
-        today = datetime.now().date().isoformat()
+        today = self._today_iso()
         return self.state.get('last_execution_date') == today
 
     def check_and_mark_execution(self) -> bool:
@@ -969,7 +1614,7 @@ class StateManager:
             False if already executed today (another instance got there first).
         """
         with _state_file_lock:
-            today = datetime.now().date().isoformat()
+            today = self._today_iso()
             if self.state.get('last_execution_date') == today:
                 logger.info("Already executed today (atomic check)")
                 return False
@@ -979,7 +1624,9 @@ class StateManager:
             self.state['last_execution_date'] = now.date().isoformat()
             self.state['last_execution_time'] = now.time().isoformat()
             self.state['execution_count'] = self.state.get('execution_count', 0) + 1
-            self.save()  # Save while holding lock
+            # Write through while holding lock
+            self._mark_dirty('full')
+            self._flush_locked(backup=True)
             logger.info("Marked as executed (atomic check-and-mark)")
             return True
 
@@ -998,33 +1645,15 @@ class StateManager:
         Returns:
             True if a matching order was already submitted today
         """
-        today = datetime.now().date().isoformat()
-        trade_log = self.state.get('trade_log', [])
-
-        for trade in trade_log:
-            # Check if trade is from today
-            trade_date = trade.get('timestamp', '')[:10]  # YYYY-MM-DD
-            if trade_date != today:
-                continue
-
-            # Check if it's the same order
-            if (trade.get('ticker') == ticker and
-                trade.get('action') == action and
-                trade.get('shares') == shares and
-                abs(trade.get('price', 0) - price) < 0.01):  # Price tolerance
-                return True
-
-        return False
+        today = self._today_iso()
+        self._todays_trades(today)
+        prices = self._today_orders.get((ticker, action, shares), ())
+        return any(abs(p - price) < 0.01 for p in prices)  # Price tolerance
 
     def get_orders_submitted_today(self) -> List[Dict]:
         """Get all orders submitted today for idempotency checking"""
-        today = datetime.now().date().isoformat()
-        trade_log = self.state.get('trade_log', [])
-
-        return [
-            trade for trade in trade_log
-            if trade.get('timestamp', '')[:10] == today
-        ]
+        today = self._today_iso()
+        return list(self._todays_trades(today))
 
     def log_error(self, error_msg: str):
         """Log an error occurrence"""
@@ -1033,15 +1662,27 @@ class StateManager:
             'timestamp': datetime.now().isoformat(),
             'message': error_msg,
         }
-        self.save()
+        self._mark_dirty()
 
     def get_trade_log(self) -> List[Dict]:
-        """Get full trade log"""
-        return self.state.get('trade_log', [])
+        """Get the most recent TRADE_LOG_MAX trades (see iter_trade_history)"""
+        return list(self._trade_log)
+
+    def _recent_trades(self, n: int) -> List[Dict]:
+        """Last n trades, oldest first, without copying the whole window."""
+        log = self._trade_log
+        return [log[i] for i in range(-min(n, len(log)), 0)]
+
+    def iter_trade_history(self) -> Iterator[Dict]:
+        """Stream every logged trade, oldest first, from trade_log_file"""
+        return _iter_ndjson(self.trade_log_file)
 
     def get_daily_values(self) -> List[Dict]:
-        """Get daily portfolio value history"""
-        return self.state.get('daily_values', [])
+        """Get daily portfolio value history (read from daily_values_file
+        on first call)"""
+        if self._daily_values is None:
+            self._daily_values = list(_iter_ndjson(self.daily_values_file))
+        return self._daily_values
 
     def write_dashboard_state(self, running: bool = False, mode: str = "IDLE",
                                step: str = None, error: str = None,
@@ -1051,6 +1692,8 @@ class StateManager:
         Write a dashboard-friendly state file for the UI to read.
 
         This is called frequently during bot execution to give real-time visibility.
+        The file is written by a background thread; only the newest snapshot
+        is kept, so bursts of updates cost one write.
 
         Args:
             running: Is the bot currently executing?
@@ -1063,17 +1706,21 @@ class StateManager:
             run_id: Unique run identifier
         """
         positions = self.get_positions()
-        positions_list = [
-            {
-                "ticker": ticker,
-                "shares": pos.get("shares", 0),
-                "entry_price": pos.get("entry_price", 0),
-                "bucket": pos.get("bucket"),
-            }
-            for ticker, pos in positions.items()
-        ]
-
-        recent_trades = self.get_trade_log()[-20:] if self.get_trade_log() else []
+        version, positions_list = self._positions_list_cache
+        if version != self._state_version:
+            positions_list = [
+                {
+                    "ticker": ticker,
+                    "shares": pos.get("shares", 0),
+                    "entry_price": pos.get("entry_price", 0),
+                    "bucket": pos.get("bucket"),
+                }
+                for ticker, pos in positions.items()
+            ]
+            self._positions_list_cache = (self._state_version, positions_list)
+
+        recent_trades = self._recent_trades(20)
+        trades_used = self.get_trades_used()
 
         dashboard_state = {
             "running": running,
@@ -1083,8 +1730,8 @@ class StateManager:
             "last_update": datetime.now().isoformat(),
             "last_result": "OK" if not error else "FAIL",
             "error": error,
-            "trades_used": self.get_trades_used(),
-            "trades_remaining": self.get_trades_remaining(),
+            "trades_used": trades_used,
+            "trades_remaining": MAX_TRADES_TOTAL - trades_used,
             "regime": regime,
             "vix": vix,
             "positions_count": len(positions),
@@ -1096,12 +1743,39 @@ class StateManager:
             "error_count": self.state.get("error_count", 0),
         }
 
-        try:
-            with open(DASHBOARD_STATE_FILE, 'w') as f:
-                json.dump(dashboard_state, f, indent=2, default=str)
-            logger.debug(f"Dashboard state written to {DASHBOARD_STATE_FILE}")
-        except Exception as e:
-            logger.warning(f"Could not write dashboard state: {e}")
+        with self._dashboard_writer_lock:
+            self._dashboard_pending = dashboard_state
+            if self._dashboard_writer is None or not self._dashboard_writer.is_alive():
+                self._dashboard_writer = threading.Thread(
+                    target=self._dashboard_loop, name='dashboard-writer', daemon=True
+                )
+                self._dashboard_writer.start()
+
+    def _dashboard_loop(self):
+        """Background writer for write_dashboard_state.
+
+        Exits once no snapshot is pending, so an idle manager pins no thread.
+        """
+        while True:
+            self.flush_dashboard()
+            with self._dashboard_writer_lock:
+                if self._dashboard_pending is None:
+                    self._dashboard_writer = None
+                    return
+
+    def flush_dashboard(self):
+        """Write the pending dashboard snapshot now (no-op if none)."""
+        with self._dashboard_io_lock:
+            dashboard_state, self._dashboard_pending = self._dashboard_pending, None
+            if dashboard_state is None:
+                return
+            try:
+                payload = _dumps_state(dashboard_state)
+                with open(DASHBOARD_STATE_FILE, 'wb') as f:
+                    f.write(payload)
+                logger.debug(f"Dashboard state written to {DASHBOARD_STATE_FILE}")
+            except Exception as e:
+                logger.warning(f"Could not write dashboard state: {e}")
 
     # =========================================================================
     # SPRINT3 STATE MANAGEMENT
@@ -1127,7 +1801,7 @@ class StateManager:
         """Update sprint3 state fields."""
         sprint3 = self.get_sprint3_state()
         sprint3.update(kwargs)
-        self.save()
+        self._mark_dirty()
 
     def is_sprint3_active(self) -> bool:
         """Check if sprint3 mode is active."""
@@ -1159,7 +1833,7 @@ class StateManager:
             'last_error': None,
             'last_screenshot': None,
         }
-        self.save()
+        self._mark_dirty()
         logger.info("Sprint3 state reset")
 
     def get_sprint3_trades_remaining(self) -> int:
@@ -1210,7 +1884,7 @@ class StateManager:
                       f"(Entry: {pos['entry_date']})")
 
         # Recent trades
-        trades = self.get_trade_log()[-5:] if self.get_trade_log() else []
+        trades = self._recent_trades(5)
         if trades:
             print("\nRECENT TRADES:")
             for trade in trades:
@@ -1256,16 +1930,20 @@ def sync_state_with_stocktrak(state_manager: StateManager,
         # DO NOT sync - keep local state intact
         return
 
-    # Update trade count if StockTrak shows different
-    if stocktrak_trade_count != state_manager.get_trades_used():
-        logger.warning(f"Trade count mismatch: local={state_manager.get_trades_used()}, "
-                       f"StockTrak={stocktrak_trade_count}")
-        state_manager.state['trades_used'] = stocktrak_trade_count
-        state_manager.state['trades_remaining'] = MAX_TRADES_TOTAL - stocktrak_trade_count
+    # Diff both sides up front (add/remove mutate local_positions)
+    missing_locally = [t for t in stocktrak_holdings if t not in local_positions]
+    missing_remote = [t for t in local_positions if t not in stocktrak_holdings]
 
-    # Check for positions that exist in StockTrak but not locally
-    for ticker in stocktrak_holdings:
-        if ticker not in local_positions:
+    # One state write for the whole sync
+    with state_manager.defer_save():
+        # Update trade count if StockTrak shows different
+        if stocktrak_trade_count != local_trades:
+            logger.warning(f"Trade count mismatch: local={local_trades}, "
+                           f"StockTrak={stocktrak_trade_count}")
+            state_manager.state['trades_used'] = stocktrak_trade_count
+
+        # Positions that exist in StockTrak but not locally
+        for ticker in missing_locally:
             logger.warning(f"Position {ticker} found in StockTrak but not in local state")
             # We can't know entry price/date, so mark as unknown
             state_manager.add_position(
@@ -1276,18 +1954,17 @@ def sync_state_with_stocktrak(state_manager: StateManager,
                 bucket=None
             )
 
-    # Check for positions in local state but not in StockTrak
-    # SAFEGUARD: Only remove if stocktrak_holdings has SOME data
-    # (if it's empty, we can't trust it)
-    if stocktrak_holdings:  # Only remove if we got valid data from StockTrak
-        for ticker in list(local_positions.keys()):
-            if ticker not in stocktrak_holdings:
+        # Positions in local state but not in StockTrak
+        # SAFEGUARD: Only remove if stocktrak_holdings has SOME data
+        # (if it's empty, we can't trust it)
+        if stocktrak_holdings:  # Only remove if we got valid data from StockTrak
+            for ticker in missing_remote:
                 logger.warning(f"Position {ticker} in local state but not in StockTrak - removing")
                 state_manager.remove_position(ticker)
-    else:
-        logger.info("Skipping position removal check - StockTrak holdings empty (may be scraping issue)")
+        else:
+            logger.info("Skipping position removal check - StockTrak holdings empty (may be scraping issue)")
 
-    state_manager.save()
+        state_manager.save()
     logger.info("State synchronization complete")
 
 
@@ -1306,9 +1983,11 @@ if __name__ == "__main__":
     sm.increment_trade_count()
 
     sm.print_status()
+    sm.flush()
 
     # Clean up test file
-    if os.path.exists('test_state.json'):
-        os.remove('test_state.json')
+    for path in ('test_state.json', sm.trade_log_file, sm.daily_values_file):
+        if os.path.exists(path):
+            os.remove(path)
     if os.path.exists('bot_state_backup.json'):
         os.remove('bot_state_backup.json')
@@ -11,8 +11,11 @@ import logging
 import time
 import os
 import re
+import json
+import atexit
 import asyncio
 import gc
+from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Callable, Any
 from datetime import datetime
@@ -104,6 +107,8 @@ import config
 # =============================================================================
 PROFILE_DIR = Path(__file__).resolve().parent / ".pw_profile"
 PROFILE_DIR.mkdir(exist_ok=True)
+# Saved cookies/localStorage for ephemeral (non-persistent) browser contexts
+SESSION_STATE_FILE = PROFILE_DIR / "storage_state.json"
 from config import (
     STOCKTRAK_URL, STOCKTRAK_LOGIN_URL, STOCKTRAK_USERNAME, STOCKTRAK_PASSWORD,
     HEADLESS_MODE, SLOW_MO, DEFAULT_TIMEOUT, ORDER_SUBMISSION_WAIT,
@@ -161,8 +166,8 @@ def run_step(page: Page, name: str, fn: Callable[[], Any], max_attempts: int = 3
 
             # Take failure screenshot
             try:
-                screenshot_path = os.path.join(SCREENSHOT_DIR, f"{name}_fail_{attempt}_{ts}.png")
-                page.screenshot(path=screenshot_path, full_page=True)
+                screenshot_path = os.path.join(SCREENSHOT_DIR, f"{name}_fail_{attempt}_{ts}.jpg")
+                page.screenshot(path=screenshot_path, full_page=True, type='jpeg', quality=60)
                 logger.info(f"[{name}] Failure screenshot: {screenshot_path}")
             except Exception as ss_err:
                 logger.debug(f"[{name}] Could not take screenshot: {ss_err}")
@@ -189,6 +194,205 @@ def run_step(page: Page, name: str, fn: Callable[[], Any], max_attempts: int = 3
     raise last_exception
 
 
+# =============================================================================
+# POPUP DISMISSAL TABLES (built once at import)
+# =============================================================================
+
+# EXCLUDED: URLs/hrefs that should NEVER be clicked
+# These are social media or external links that would navigate away
+_EXCLUDED_HREF_PATTERNS: Tuple[str, ...] = (
+    'facebook', 'twitter', 'linkedin', 'instagram', 'youtube',
+    'mailto:', 'tel:', '/about', '/contact', '/help', '/support',
+    '/terms', '/privacy', '/faq', 'stocktrak.com/StockTrak'
+)
+
+# Safe button text patterns (ONLY for actual buttons, not links)
+_DISMISS_BUTTON_PATTERNS: Tuple[re.Pattern, ...] = tuple(re.compile(p, re.I) for p in (
+    r"^don't show again$",
+    r"^remind me later$",
+    r"^skip tour$",
+    r"^skip$",
+    r"^no thanks$",
+    r"^got it$",
+    r"^close$",
+    r"^done$",
+    r"^dismiss$",
+    r"^end tour$",
+    r"^maybe later$",
+    r"^cancel$",
+    r"^×$",  # X symbol
+    r"^x$",  # letter X
+))
+
+# Dismiss links, only looked for INSIDE a visible modal
+_DISMISS_LINK_PATTERNS: Tuple[re.Pattern, ...] = tuple(
+    re.compile(p, re.I) for p in (r"skip", r"close", r"no thanks", r"maybe later", r"remind me")
+)
+
+# Specific CSS selectors for known modals (SAFE - inside modals only)
+_DISMISS_SELECTORS: Tuple[str, ...] = (
+    # Robinhood promo modal (exact IDs)
+    "#btn-dont-show-again",
+    "#btn-remindlater",
+    "#OverlayModalPopup button",
+
+    # Tour library specific (Intro.js, Shepherd.js, Hopscotch)
+    ".introjs-skipbutton",
+    ".introjs-donebutton",
+    ".shepherd-cancel-icon",
+    ".shepherd-button-secondary",
+    ".hopscotch-bubble-close",
+    ".tour-skip",
+    ".tour-close",
+    ".tour-end",
+    ".walkthrough-skip",
+    ".walkthrough-close",
+
+    # Generic modal close buttons - MUST be inside .modal or overlay
+    ".modal .close",
+    ".modal .btn-close",
+    ".modal-close",
+    ".modal button.close",
+    "[role='dialog'] button[aria-label='Close']",
+    "[role='dialog'] .close",
+    ".overlay .close",
+    ".popup .close",
+
+    # Bootstrap modal close
+    ".modal-header .close",
+    ".modal-header .btn-close",
+
+    # UI dialog close
+    ".ui-dialog-titlebar-close",
+)
+
+# Containers that mean "some popup is up". If none of these and none of
+# _DISMISS_SELECTORS is visible, the page is quiet and a pass can stop
+# before the per-button probes and the ESC press.
+_POPUP_CONTAINER_SELECTORS: Tuple[str, ...] = (
+    ".modal",
+    "[role='dialog']",
+    ".overlay",
+    "#OverlayModalPopup",
+    ".popup",
+    ".ui-dialog",
+    ".introjs-overlay",
+    ".introjs-tooltip",
+    ".shepherd-element",
+    ".hopscotch-bubble",
+    ".tour-backdrop",
+    "[class*='cookie']",
+    "[id*='cookie']",
+)
+
+# Dismiss hits per selector / button pattern across runs. The popups StockTrak
+# actually shows get tried first; persisted to logs/popup_priors.json at exit.
+POPUP_PRIORS_FILE = os.path.join(SCREENSHOT_DIR, 'popup_priors.json')
+_HIT_COUNTS: Dict[str, int] = defaultdict(int)
+_hit_counts_dirty = False
+
+
+def _load_popup_priors():
+    """Seed _HIT_COUNTS from the priors file, if there is a readable one."""
+    try:
+        with open(POPUP_PRIORS_FILE, 'r') as f:
+            for key, hits in json.load(f).items():
+                _HIT_COUNTS[key] = int(hits)
+    except (OSError, ValueError, AttributeError, TypeError):
+        pass
+
+
+def _record_popup_hit(key: str):
+    global _hit_counts_dirty
+    _HIT_COUNTS[key] += 1
+    _hit_counts_dirty = True
+
+
+def _save_popup_priors():
+    """Write hit counts back to disk (atomic replace). Registered with atexit."""
+    if not _hit_counts_dirty:
+        return
+    tmp_path = POPUP_PRIORS_FILE + '.tmp'
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(dict(_HIT_COUNTS), f, indent=2, sort_keys=True)
+        os.replace(tmp_path, POPUP_PRIORS_FILE)
+    except OSError as e:
+        logger.debug(f"Could not save popup priors: {e}")
+
+
+_load_popup_priors()
+atexit.register(_save_popup_priors)
+
+# Returns the subset of CSS selectors whose first match is currently visible
+# (same test as Playwright's is_visible: rendered box, not visibility:hidden).
+# One evaluate instead of one driver round-trip per selector.
+_VISIBLE_SELECTORS_JS = """
+(selectors) => selectors.filter((sel) => {
+    let el;
+    try { el = document.querySelector(sel); } catch (e) { return false; }
+    if (!el) return false;
+    return getComputedStyle(el).visibility !== 'hidden' && el.getClientRects().length > 0;
+})
+"""
+
+# First of the (lowercase) needles found in the page's rendered text, or null.
+# innerText skips hidden elements, so this stands in for text=... visibility.
+_FIND_BODY_TEXT_JS = """
+(needles) => {
+    const text = (document.body ? document.body.innerText : '').toLowerCase().replace(/\\s+/g, ' ');
+    return needles.find((n) => text.includes(n)) || null;
+}
+"""
+
+# Every "$1,234.56"-style amount in the page's rendered text
+_DOLLAR_AMOUNTS_JS = """
+() => (document.body ? document.body.innerText : '').match(/\\$[\\d,]+\\.?\\d*/g) || []
+"""
+
+# Cell texts of every table matching a selector: tables -> rows -> td texts
+_TABLE_CELLS_JS = """
+(sel) => Array.from(document.querySelectorAll(sel)).map((table) =>
+    Array.from(table.querySelectorAll('tr')).map((row) =>
+        Array.from(row.querySelectorAll('td')).map((cell) => cell.textContent)))
+"""
+
+# Data rows on StockTrak's history/positions tables (see wait_for_table_rows)
+_TABLE_ROW_SELECTOR = "table tbody tr, .transaction-row, .trade-row"
+
+# True if any element matching any of the selectors is visible
+_ANY_VISIBLE_JS = """
+(selectors) => selectors.some((sel) => {
+    let els;
+    try { els = document.querySelectorAll(sel); } catch (e) { return false; }
+    for (const el of els) {
+        if (getComputedStyle(el).visibility !== 'hidden' && el.getClientRects().length > 0) return true;
+    }
+    return false;
+})
+"""
+
+
+# =============================================================================
+# PAGE TEXT PATTERNS (compiled once at import)
+# =============================================================================
+
+# Leading ticker symbol in a holdings table cell
+_TICKER_RE = re.compile(r'^([A-Z]{1,5})\b')
+
+# "TRADES MADE X / 300" on the KPI strip, most specific first
+_TRADE_COUNT_PATTERNS: Tuple[re.Pattern, ...] = tuple(re.compile(p, re.I) for p in (
+    r'TRADES?\s*MADE\s*(\d+)\s*/\s*(\d+)',  # "TRADES MADE 0 / 300"
+    r'(\d+)\s*/\s*300',                      # "0 / 300" near trade context
+    r'(\d+)\s+/\s+(\d+)\s*trades?',         # "0 / 300 trades"
+))
+_TRADE_COUNT_FALLBACK_RE = re.compile(r'(\d+)\s*(?:/|of)\s*\d+')
+
+# Money values WITH OR WITHOUT $: "$500,315.16" or "500,315.16"
+# (optional $, 1-3 digits, comma groups of 3, then 2 decimals)
+_MONEY_RE = re.compile(r'\$?\s*(\d{1,3}(?:,\d{3})+\.\d{2})')
+
+
 def dismiss_stocktrak_overlays(page, total_ms: int = 15000, max_attempts: int = None) -> int:
     """
     Carefully dismiss popups/modals that block interaction.
@@ -212,96 +416,51 @@ def dismiss_stocktrak_overlays(page, total_ms: int = 15000, max_attempts: int =
     dismissed_count = 0
     end_time = time.time() + (total_ms / 1000)
 
-    # EXCLUDED: URLs/hrefs that should NEVER be clicked
-    # These are social media or external links that would navigate away
-    excluded_href_patterns = [
-        'facebook', 'twitter', 'linkedin', 'instagram', 'youtube',
-        'mailto:', 'tel:', '/about', '/contact', '/help', '/support',
-        '/terms', '/privacy', '/faq', 'stocktrak.com/StockTrak'
-    ]
-
-    # Safe button text patterns (ONLY for actual buttons, not links)
-    safe_button_patterns = [
-        r"^don't show again$",
-        r"^remind me later$",
-        r"^skip tour$",
-        r"^skip$",
-        r"^no thanks$",
-        r"^got it$",
-        r"^close$",
-        r"^done$",
-        r"^dismiss$",
-        r"^end tour$",
-        r"^maybe later$",
-        r"^cancel$",
-        r"^×$",  # X symbol
-        r"^x$",  # letter X
-    ]
-
-    # Specific CSS selectors for known modals (SAFE - inside modals only)
-    modal_selectors = [
-        # Robinhood promo modal (exact IDs)
-        "#btn-dont-show-again",
-        "#btn-remindlater",
-        "#OverlayModalPopup button",
-
-        # Tour library specific (Intro.js, Shepherd.js, Hopscotch)
-        ".introjs-skipbutton",
-        ".introjs-donebutton",
-        ".shepherd-cancel-icon",
-        ".shepherd-button-secondary",
-        ".hopscotch-bubble-close",
-        ".tour-skip",
-        ".tour-close",
-        ".tour-end",
-        ".walkthrough-skip",
-        ".walkthrough-close",
-
-        # Generic modal close buttons - MUST be inside .modal or overlay
-        ".modal .close",
-        ".modal .btn-close",
-        ".modal-close",
-        ".modal button.close",
-        "[role='dialog'] button[aria-label='Close']",
-        "[role='dialog'] .close",
-        ".overlay .close",
-        ".popup .close",
-
-        # Bootstrap modal close
-        ".modal-header .close",
-        ".modal-header .btn-close",
-
-        # UI dialog close
-        ".ui-dialog-titlebar-close",
-    ]
+    # Most-hit first (stable sort keeps source order among ties)
+    selectors = sorted(_DISMISS_SELECTORS, key=lambda sel: -_HIT_COUNTS[sel])
+    button_patterns = sorted(_DISMISS_BUTTON_PATTERNS, key=lambda p: -_HIT_COUNTS[p.pattern])
+    containers = list(_POPUP_CONTAINER_SELECTORS)
 
     while time.time() < end_time:
         closed_any = False
 
+        # Probe all modal CSS selectors in one evaluate. If none is visible
+        # and no popup container is up either, there is nothing to dismiss.
+        try:
+            visible_selectors = page.evaluate(_VISIBLE_SELECTORS_JS, selectors)
+            if not visible_selectors and not page.evaluate(_ANY_VISIBLE_JS, containers):
+                break
+        except Exception:
+            visible_selectors = []
+
         # Method 1: Click buttons by accessible name (role=button)
         # Buttons are generally safe - they don't navigate away
-        for pattern in safe_button_patterns:
+        # count() is an instant existence check; only matches get a visibility probe
+        for pattern in button_patterns:
             try:
-                btn = page.get_by_role("button", name=re.compile(pattern, re.I)).first
-                if btn.is_visible(timeout=300):
+                buttons = page.get_by_role("button", name=pattern)
+                if buttons.count() == 0:
+                    continue
+                btn = buttons.first
+                if btn.is_visible(timeout=0):
                     btn.click(force=True, timeout=1000)
+                    _record_popup_hit(pattern.pattern)
                     dismissed_count += 1
                     closed_any = True
-                    logger.info(f"Dismissed popup #{dismissed_count} via button: {pattern}")
+                    logger.info(f"Dismissed popup #{dismissed_count} via button: {pattern.pattern}")
                     time.sleep(0.2)
             except Exception:
                 pass
 
-        # Method 2: Click specific modal CSS selectors
-        for sel in modal_selectors:
+        # Method 2: Click the modal CSS selectors that were visible
+        for sel in visible_selectors:
             try:
-                loc = page.locator(sel).first
-                if loc.is_visible(timeout=200):
-                    loc.click(force=True, timeout=800)
-                    dismissed_count += 1
-                    closed_any = True
-                    logger.info(f"Dismissed popup #{dismissed_count} via selector: {sel}")
-                    time.sleep(0.2)
+                page.locator(sel).first.click(force=True, timeout=800)
+                _record_popup_hit(sel)
+                dismissed_count += 1
+                closed_any = True
+                logger.info(f"Dismissed popup #{dismissed_count} via selector: {sel}")
+                time.sleep(0.2)
             except Exception:
                 pass
 
@@ -315,20 +474,24 @@ def dismiss_stocktrak_overlays(page, total_ms: int = 15000, max_attempts: int =
         # Method 4: Look for links ONLY inside modals/overlays
         # Check if there's an active modal first
         try:
-            modal = page.locator(".modal:visible, [role='dialog']:visible, .overlay:visible, #OverlayModalPopup:visible").first
-            if modal.is_visible(timeout=200):
+            modals = page.locator(".modal:visible, [role='dialog']:visible, .overlay:visible, #OverlayModalPopup:visible")
+            if modals.count() > 0:
+                modal = modals.first
                 # Only look for dismiss links INSIDE the modal
-                for pattern in [r"skip", r"close", r"no thanks", r"maybe later", r"remind me"]:
+                for pattern in _DISMISS_LINK_PATTERNS:
                     try:
-                        link = modal.get_by_role("link", name=re.compile(pattern, re.I)).first
-                        if link.is_visible(timeout=200):
+                        links = modal.get_by_role("link", name=pattern)
+                        if links.count() == 0:
+                            continue
+                        link = links.first
+                        if link.is_visible(timeout=0):
                             # CRITICAL: Verify link doesn't go to social media
                             href = link.get_attribute("href") or ""
-                            if not any(excluded in href.lower() for excluded in excluded_href_patterns):
+                            if not any(excluded in href.lower() for excluded in _EXCLUDED_HREF_PATTERNS):
                                 link.click(force=True, timeout=800)
                                 dismissed_count += 1
                                 closed_any = True
-                                logger.info(f"Dismissed popup #{dismissed_count} via modal link: {pattern}")
+                                logger.info(f"Dismissed popup #{dismissed_count} via modal link: {pattern.pattern}")
                                 time.sleep(0.2)
                     except Exception:
                         pass
@@ -378,7 +541,10 @@ def verify_page_ready(page, expected_url_contains: str = None, required_element:
 
         for sel in blocking_selectors:
             try:
-                if page.locator(sel).first.is_visible(timeout=200):
+                overlay = page.locator(sel)
+                if overlay.count() == 0:
+                    continue
+                if overlay.first.is_visible(timeout=0):
                     return False, f"Blocking overlay detected: {sel}"
             except:
                 pass
@@ -508,10 +674,42 @@ def ensure_clean_ui(page, timeout_ms: int = 15000) -> bool:
     return True
 
 
+def wait_for_table_rows(page, timeout_ms: int = 15000) -> bool:
+    """
+    Wait for a page's DOM plus its first data row, instead of networkidle.
+
+    StockTrak keeps analytics requests going, so networkidle often stalls for
+    seconds after the data is already on screen. An empty history table is
+    not an error: on timeout this just returns False and callers carry on.
+
+    Args:
+        page: Playwright page object
+        timeout_ms: How long to wait for a row to appear
+
+    Returns:
+        True if a data row became visible
+    """
+    page.wait_for_load_state('domcontentloaded')
+    try:
+        page.wait_for_selector(_TABLE_ROW_SELECTOR, state='visible', timeout=timeout_ms)
+        return True
+    except Exception:
+        logger.debug(f"No table rows visible after {timeout_ms}ms on {page.url}")
+        return False
+
+
+def debug_screenshots_enabled() -> bool:
+    """True when success-path diagnostic screenshots should be captured."""
+    return SCREENSHOT_ON_ERROR and logger.isEnabledFor(logging.DEBUG)
+
+
 def take_debug_screenshot(page, name: str) -> str:
     """
     Take a screenshot and return the full path.
 
+    Debug shots are JPEG at quality 60 - far smaller and cheaper to encode
+    than a full-viewport PNG, and still legible for diagnosing a page.
+
     Args:
         page: Playwright page object
         name: Base name for the screenshot
@@ -520,11 +718,11 @@ def take_debug_screenshot(page, name: str) -> str:
         Full path to the screenshot file
     """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{name}_{timestamp}.png"
+    filename = f"{name}_{timestamp}.jpg"
     filepath = os.path.join(SCREENSHOT_DIR, filename)
 
     try:
-        page.screenshot(path=filepath)
+        page.screenshot(path=filepath, type='jpeg', quality=60)
         logger.info(f"Screenshot saved: {filepath}")
         return filepath
     except Exception as e:
@@ -551,6 +749,11 @@ class StockTrakBot:
         self.page: Optional[Page] = None
         self.logged_in = False
 
+        # Last selector that worked, per lookup (see _cached_first)
+        self._selector_cache: Dict[str, str] = {}
+        # Last candidate URL that worked, per page (see get_portfolio_value)
+        self._url_cache: Dict[str, str] = {}
+
         # Ensure logs directory exists
         os.makedirs('logs', exist_ok=True)
 
@@ -596,14 +799,15 @@ class StockTrakBot:
                 self.page = self.context.new_page()
             logger.info(f"Using persistent profile: {PROFILE_DIR}")
         else:
-            # Ephemeral context (fresh every time)
+            # Ephemeral context, seeded with the last logged-in session if any
             self.browser = self.playwright.chromium.launch(
                 headless=self.headless,
                 slow_mo=SLOW_MO,
             )
             self.context = self.browser.new_context(
                 viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                storage_state=str(SESSION_STATE_FILE) if SESSION_STATE_FILE.exists() else None,
             )
             self.page = self.context.new_page()
 
@@ -627,6 +831,27 @@ class StockTrakBot:
         Returns:
             True if login successful, False otherwise
         """
+        logged_in = self._login()
+        if logged_in:
+            self._save_session()
+        return logged_in
+
+    def _save_session(self):
+        """
+        Save cookies/localStorage so the next ephemeral context starts logged
+        in with "Don't show again" choices kept. The persistent profile
+        already keeps these on disk.
+        """
+        if self.browser is None:
+            return
+        try:
+            self.context.storage_state(path=str(SESSION_STATE_FILE))
+            logger.debug(f"Session state saved to {SESSION_STATE_FILE}")
+        except Exception as e:
+            logger.debug(f"Could not save session state: {e}")
+
+    def _login(self) -> bool:
+        """login() body."""
         logger.info("Attempting login to StockTrak...")
 
         try:
@@ -641,6 +866,13 @@ class StockTrakBot:
                 logger.error("Failed to reach StockTrak login page")
                 return False
 
+            # A saved session redirects the login URL to the dashboard: skip
+            # the popup pass and the form entirely
+            if '/login' not in self.page.url.lower() and self._check_logged_in():
+                logger.info("Already logged in (from saved session)")
+                self.logged_in = True
+                return True
+
             # Now safe to dismiss popups (they're StockTrak popups, not external sites)
             dismiss_stocktrak_overlays(self.page, total_ms=10000)
             time.sleep(1)
@@ -651,7 +883,8 @@ class StockTrakBot:
                 return False
 
             # Screenshot for debugging
-            take_debug_screenshot(self.page, 'login_page')
+            if debug_screenshots_enabled():
+                take_debug_screenshot(self.page, 'login_page')
 
             # Check if already logged in (persistent profile may have session)
             if self._check_logged_in():
@@ -692,7 +925,7 @@ class StockTrakBot:
             ]
 
             # Fill username
-            username_filled = self._try_fill(username_selectors, self.username)
+            username_filled = self._try_fill(username_selectors, self.username, cache_key='login_username')
             if not username_filled:
                 # CRITICAL: Before failing, check if we're actually logged in
                 # (login page may have redirected to dashboard)
@@ -708,7 +941,7 @@ class StockTrakBot:
                 return False
 
             # Fill password
-            password_filled = self._try_fill(password_selectors, self.password)
+            password_filled = self._try_fill(password_selectors, self.password, cache_key='login_password')
             if not password_filled:
                 # Same check - maybe we got logged in somehow
                 logger.warning("Could not find password field - checking if already logged in...")
@@ -724,7 +957,7 @@ class StockTrakBot:
             time.sleep(0.5)
 
             # Click submit
-            submitted = self._try_click(submit_selectors)
+            submitted = self._try_click(submit_selectors, cache_key='login_submit')
             if not submitted:
                 logger.error("Could not find submit button")
                 screenshot_path = take_debug_screenshot(self.page, 'login_error_submit')
@@ -750,7 +983,8 @@ class StockTrakBot:
                 logger.error("Navigated away from StockTrak during post-login popup dismissal!")
                 return False
 
-            take_debug_screenshot(self.page, 'after_login_popups_cleared')
+            if debug_screenshots_enabled():
+                take_debug_screenshot(self.page, 'after_login_popups_cleared')
 
             # CHECKPOINT: Wait for a known logged-in element
             # "Portfolio Simulation" only exists when logged in
@@ -1049,19 +1283,18 @@ class StockTrakBot:
                 if not nav_found:
                     errors.append("No navigation elements found - page may not be fully loaded")
 
-            # Step 5: Take verification screenshot
-            logger.info("Step 5: Taking verification screenshot...")
-            screenshot_path = take_debug_screenshot(self.page, 'verification_complete')
-
-            # Report results
+            # Report results (screenshot failures always, successes only when debugging)
             if errors:
                 error_msg = "; ".join(errors)
                 logger.error(f"VERIFICATION FAILED: {error_msg}")
+                screenshot_path = take_debug_screenshot(self.page, 'verification_failed')
                 logger.error(f"Verification screenshot: {screenshot_path}")
                 return False, error_msg
             else:
                 logger.info("=== VERIFICATION PASSED - READY FOR TRADING ===")
-                logger.info(f"Verification screenshot: {screenshot_path}")
+                if debug_screenshots_enabled():
+                    screenshot_path = take_debug_screenshot(self.page, 'verification_complete')
+                    logger.debug(f"Verification screenshot: {screenshot_path}")
                 return True, "Ready for trading"
 
         except Exception as e:
@@ -1119,7 +1352,15 @@ class StockTrakBot:
                 f"{self.base_url}/dashboard",
             ]
 
+            cached_url = self._url_cache.get('portfolio')
+            if cached_url:
+                portfolio_urls = [cached_url] + [u for u in portfolio_urls if u != cached_url]
+
             for url in portfolio_urls:
+                # Skip candidates the server says are missing without rendering them
+                if url != cached_url and self._url_missing(url):
+                    logger.debug(f"Skipping missing portfolio URL: {url}")
+                    continue
                 try:
                     self.page.goto(url)
                     self.page.wait_for_load_state('domcontentloaded')
@@ -1127,12 +1368,14 @@ class StockTrakBot:
                     # Clear any popups that appear on navigation
                     dismiss_stocktrak_overlays(self.page, total_ms=2000)
                     if 'portfolio' in self.page.url.lower() or 'dashboard' in self.page.url.lower():
+                        self._url_cache['portfolio'] = url
                         break
                 except:
                     continue
 
             time.sleep(2)
-            self._screenshot('portfolio_page')
+            if debug_screenshots_enabled():
+                self._screenshot('portfolio_page')
 
             # Try to find portfolio value
             value_selectors = [
@@ -1148,7 +1391,7 @@ class StockTrakBot:
                 'div:has-text("Portfolio Value")',
             ]
 
-            for selector in value_selectors:
+            for selector in self._cached_first('portfolio_value', value_selectors):
                 try:
                     elements = self.page.locator(selector).all()
                     for elem in elements:
@@ -1157,15 +1400,15 @@ class StockTrakBot:
                             value = parse_currency(text)
                             # Sanity check - expect value around $1M for this competition
                             if value and 100000 < value < 10000000:
+                                self._selector_cache['portfolio_value'] = selector
                                 logger.info(f"Portfolio value: ${value:,.2f}")
                                 return value
                 except:
                     continue
 
             # Try finding any large dollar amount on the page
-            page_text = self.page.content()
-            import re
-            amounts = re.findall(r'\$[\d,]+\.?\d*', page_text)
+            # (scanned in the browser; only the matches come back)
+            amounts = self.page.evaluate(_DOLLAR_AMOUNTS_JS) or []
             for amount_str in amounts:
                 value = parse_currency(amount_str)
                 if value and 100000 < value < 10000000:
@@ -1206,7 +1449,8 @@ class StockTrakBot:
                 # Continue anyway - page might have loaded
 
             time.sleep(2)
-            self._screenshot('holdings_dashboard')
+            if debug_screenshots_enabled():
+                self._screenshot('holdings_dashboard')
 
             # METHOD 1: Use JavaScript to find Open Positions table
             js_find_holdings = """
@@ -1273,31 +1517,30 @@ class StockTrakBot:
                 # Try to find tables with ticker-like content
                 table_selectors = ['table', '.positions-table', '.holdings-table']
 
-                for selector in table_selectors:
+                for selector in self._cached_first('holdings_table', table_selectors):
                     try:
-                        tables = self.page.locator(selector).all()
-                        for table in tables:
-                            rows = table.locator('tr').all()
-                            for row in rows:
-                                cells = row.locator('td').all()
+                        # Every table's cell texts in one round-trip
+                        tables = self.page.evaluate(_TABLE_CELLS_JS, selector)
+                        for rows in tables:
+                            for cells in rows:
                                 if len(cells) >= 2:
-                                    ticker_text = cells[0].text_content().strip().upper()
-                                    match = re.match(r'^([A-Z]{1,5})\b', ticker_text)
+                                    ticker_text = cells[0].strip().upper()
+                                    match = _TICKER_RE.match(ticker_text)
                                     if match:
                                         ticker = match[1]
                                         # Filter out placeholder words
                                         if ticker in PLACEHOLDER_WORDS:
                                             continue
-                                        shares_text = cells[1].text_content()
-                                        shares = parse_number(shares_text)
+                                        shares = parse_number(cells[1])
                                         if shares and shares > 0:
                                             holdings[ticker] = {
                                                 'shares': int(shares),
-                                                'raw_data': [c.text_content() for c in cells]
+                                                'raw_data': cells
                                             }
                             if holdings:
                                 break
                         if holdings:
+                            self._selector_cache['holdings_table'] = selector
                             break
                     except Exception as e:
                         logger.debug(f"Table parse error with {selector}: {e}")
@@ -1329,7 +1572,7 @@ class StockTrakBot:
                 'div:has-text("Available")',
             ]
 
-            for selector in cash_selectors:
+            for selector in self._cached_first('cash_balance', cash_selectors):
                 try:
                     elements = self.page.locator(selector).all()
                     for elem in elements:
@@ -1337,6 +1580,7 @@ class StockTrakBot:
                         if '$' in text:
                             value = parse_currency(text)
                             if value and value > 0:
+                                self._selector_cache['cash_balance'] = selector
                                 logger.info(f"Cash balance: ${value:,.2f}")
                                 return value
                 except:
@@ -1348,7 +1592,7 @@ class StockTrakBot:
             logger.error(f"Error getting cash: {e}")
             return None
 
-    def get_transaction_count(self) -> int:
+    def get_transaction_count(self, reload: bool = True) -> int:
         """
         Get total number of executed trades from trade page KPI strip.
         CRITICAL for staying under 80 trade limit.
@@ -1356,33 +1600,35 @@ class StockTrakBot:
         Reads "TRADES MADE X / 300" from the /trading/equities page.
         This avoids the broken /portfolio/transactions endpoint (404).
 
+        Args:
+            reload: Navigate to the trade page first. Pass False right after
+                get_capital_from_trade_kpis to read the KPI strip already
+                loaded (the count must not be stale, e.g. after an order).
+
         Returns:
             Number of trades executed
         """
         try:
-            # Navigate to canonical trade page (which has KPI strip with trade count)
-            trade_url = self._trade_equities_url("VOO")
-            logger.info(f"Reading trade count from: {trade_url}")
-            self.page.goto(trade_url)
-            self.page.wait_for_load_state('domcontentloaded')
-            time.sleep(1)
+            if reload or '/trading/equities' not in self.page.url.lower():
+                # Navigate to canonical trade page (which has KPI strip with trade count)
+                trade_url = self._trade_equities_url("VOO")
+                logger.info(f"Reading trade count from: {trade_url}")
+                self.page.goto(trade_url)
+                self.page.wait_for_load_state('domcontentloaded')
+                time.sleep(1)
 
-            # Dismiss any popups
-            dismiss_stocktrak_overlays(self.page, total_ms=2000)
+                # Dismiss any popups
+                dismiss_stocktrak_overlays(self.page, total_ms=2000)
+            else:
+                logger.info(f"Reading trade count from current page: {self.page.url}")
 
             # Get page text
             body_text = self.page.locator('body').inner_text()
 
             # Look for "TRADES MADE X / 300" or similar pattern
             # Pattern matches: "0 / 300", "5/300", "TRADES MADE 0 / 300", etc.
-            patterns = [
-                r'TRADES?\s*MADE\s*(\d+)\s*/\s*(\d+)',  # "TRADES MADE 0 / 300"
-                r'(\d+)\s*/\s*300',                      # "0 / 300" near trade context
-                r'(\d+)\s+/\s+(\d+)\s*trades?',         # "0 / 300 trades"
-            ]
-
-            for pattern in patterns:
-                match = re.search(pattern, body_text, re.IGNORECASE)
+            for pattern in _TRADE_COUNT_PATTERNS:
+                match = pattern.search(body_text)
                 if match:
                     trade_count = int(match.group(1))
                     logger.info(f"Trade count from KPI strip: {trade_count}")
@@ -1390,7 +1636,7 @@ class StockTrakBot:
 
             # Fallback: look for just a number near "trades" text
             # This is less reliable but better than 0
-            trade_match = re.search(r'(\d+)\s*(?:/|of)\s*\d+', body_text)
+            trade_match = _TRADE_COUNT_FALLBACK_RE.search(body_text)
             if trade_match:
                 count = int(trade_match.group(1))
                 if count < 100:  # Sanity check
@@ -1404,6 +1650,20 @@ class StockTrakBot:
             logger.error(f"Error getting transaction count: {e}")
             return 0
 
+    def _url_missing(self, url: str) -> bool:
+        """
+        HEAD-probe a URL with the page's cookies (no rendering).
+
+        True only for a definite 404/410; anything else, including a server
+        that rejects HEAD or a probe error, is left for goto() to decide.
+        """
+        try:
+            response = self.page.request.fetch(url, method='HEAD', timeout=10000)
+            return response.status in (404, 410)
+        except Exception as e:
+            logger.debug(f"HEAD probe failed for {url}: {e}")
+            return False
+
     def _trade_equities_url(self, ticker: str) -> str:
         """
         Build the correct trade page URL for a ticker.
@@ -1546,19 +1806,17 @@ class StockTrakBot:
         time.sleep(0.5)
 
         # Take screenshot for debugging
-        screenshot_path = take_debug_screenshot(self.page, f'trade_kpis_{ticker}')
-        logger.info(f"Trade KPIs screenshot: {screenshot_path}")
+        if debug_screenshots_enabled():
+            screenshot_path = take_debug_screenshot(self.page, f'trade_kpis_{ticker}')
+            logger.debug(f"Trade KPIs screenshot: {screenshot_path}")
 
         try:
             # Get ALL text from the page body
             body_text = self.page.locator('body').inner_text()
             logger.debug(f"Body text length: {len(body_text)}")
 
-            # Regex that matches money values WITH OR WITHOUT $
-            # Matches: $500,315.16 OR 500,315.16
-            # Pattern: optional $, optional whitespace, 1-3 digits, then groups of comma+3 digits, then decimal+2 digits
-            money_pattern = r'\$?\s*(\d{1,3}(?:,\d{3})+\.\d{2})'
-            matches = re.findall(money_pattern, body_text)
+            # Money values WITH OR WITHOUT $ (see _MONEY_RE)
+            matches = _MONEY_RE.findall(body_text)
 
             logger.info(f"Raw money matches: {matches[:20]}")  # Log first 20 matches
 
@@ -1638,7 +1896,7 @@ class StockTrakBot:
             # Click on Stocks or Equities submenu
             stocks_link = self.page.get_by_role("link", name=re.compile("stock|equit", re.I)).first
             stocks_link.click()
-            self.page.wait_for_load_state("networkidle")
+            self.page.wait_for_load_state("domcontentloaded")
             dismiss_stocktrak_overlays(self.page, total_ms=5000)
 
             # Fill symbol in the search box
@@ -1646,7 +1904,7 @@ class StockTrakBot:
             symbol_input.wait_for(state="visible", timeout=10000)
             symbol_input.fill(ticker.upper())
             symbol_input.press("Enter")
-            self.page.wait_for_load_state("networkidle")
+            self.page.wait_for_load_state("domcontentloaded")
             dismiss_stocktrak_overlays(self.page, total_ms=5000)
 
             # Verify we're on the trade page
@@ -2191,22 +2449,26 @@ class StockTrakBot:
         # Check for authenticated-only content
         authenticated_indicators = [
             # These ONLY appear when logged in, never on login page
-            "text=PORTFOLIO VALUE",
-            "text=BUYING POWER",
-            "text=CASH BALANCE",
-            "text=Open Positions",
-            "text=Closed Positions",
-            "text=Transaction History",
-            "text=My Dashboard",
+            "portfolio value",
+            "buying power",
+            "cash balance",
+            "open positions",
+            "closed positions",
+            "transaction history",
+            "my dashboard",
         ]
 
-        for indicator in authenticated_indicators:
-            try:
-                if self.page.locator(indicator).first.is_visible(timeout=1500):
-                    logger.info(f"Confirmed logged in via: {indicator}")
-                    return True
-            except Exception:
-                pass
+        # Match against rendered text in the browser; only the hit comes back.
+        # Polled briefly so a dashboard still rendering after goto counts.
+        try:
+            indicator = self.page.wait_for_function(
+                _FIND_BODY_TEXT_JS, arg=authenticated_indicators, timeout=1500
+            ).json_value()
+            if indicator:
+                logger.info(f"Confirmed logged in via: {indicator}")
+                return True
+        except Exception:
+            pass
 
         # URL-based check (only if NOT on login page)
         if 'dashboard' in current_url or 'portfolio' in current_url or 'trading' in current_url:
@@ -2250,7 +2512,7 @@ class StockTrakBot:
             self.page.get_by_role("link", name=re.compile("My Portfolio", re.I)).hover()
             time.sleep(0.3)
             self.page.get_by_role("link", name=re.compile("Transaction History", re.I)).click()
-            self.page.wait_for_load_state("networkidle")
+            wait_for_table_rows(self.page)
             dismiss_stocktrak_overlays(self.page, total_ms=5000)
 
             # Look for the ticker in recent transactions
@@ -2275,7 +2537,7 @@ class StockTrakBot:
             self.page.get_by_role("link", name=re.compile("My Portfolio", re.I)).hover()
             time.sleep(0.3)
             self.page.get_by_role("link", name=re.compile("Order History", re.I)).click()
-            self.page.wait_for_load_state("networkidle")
+            wait_for_table_rows(self.page)
             dismiss_stocktrak_overlays(self.page, total_ms=5000)
 
             time.sleep(1)
@@ -2311,7 +2573,7 @@ class StockTrakBot:
             self.page.get_by_role("link", name=re.compile("My Portfolio", re.I)).hover()
             time.sleep(0.3)
             self.page.get_by_role("link", name=re.compile("Transaction History", re.I)).click()
-            self.page.wait_for_load_state("networkidle")
+            wait_for_table_rows(self.page)
             dismiss_stocktrak_overlays(self.page, total_ms=5000)
 
             time.sleep(1)
@@ -2353,17 +2615,35 @@ class StockTrakBot:
             take_debug_screenshot(self.page, f'trade_note_error_{ticker}')
             return False, f"Error: {e}"
 
-    def _try_fill(self, selectors: List[str], value: str, timeout: int = 2000) -> bool:
+    def _cached_first(self, key: str, selectors: List[str]) -> List[str]:
+        """
+        Return selectors with the last one that worked for key tried first.
+
+        StockTrak's markup is stable within a session, so after the first hit
+        the fallback list is only walked if the page changes.
+        """
+        cached = self._selector_cache.get(key)
+        if cached is None or cached not in selectors:
+            return selectors
+        return [cached] + [s for s in selectors if s != cached]
+
+    def _try_fill(self, selectors: List[str], value: str, timeout: int = 2000,
+                  cache_key: str = None) -> bool:
         """
         Try multiple selectors to fill a form field.
 
         Uses wait_for() pattern for reliability instead of count() > 0.
+        With cache_key, the selector that worked is tried first next time.
         """
+        if cache_key:
+            selectors = self._cached_first(cache_key, selectors)
         for selector in selectors:
             try:
                 loc = self.page.locator(selector).first
                 loc.wait_for(state="visible", timeout=timeout)
                 loc.fill(value)
+                if cache_key:
+                    self._selector_cache[cache_key] = selector
                 logger.debug(f"Filled '{value}' with selector: {selector}")
                 return True
             except Exception as e:
@@ -2371,17 +2651,23 @@ class StockTrakBot:
                 continue
         return False
 
-    def _try_click(self, selectors: List[str], timeout: int = 2000) -> bool:
+    def _try_click(self, selectors: List[str], timeout: int = 2000,
+                   cache_key: str = None) -> bool:
         """
         Try multiple selectors to click an element.
 
         Uses wait_for() pattern for reliability instead of count() > 0.
+        With cache_key, the selector that worked is tried first next time.
         """
+        if cache_key:
+            selectors = self._cached_first(cache_key, selectors)
         for selector in selectors:
             try:
                 loc = self.page.locator(selector).first
                 loc.wait_for(state="visible", timeout=timeout)
                 loc.click()
+                if cache_key:
+                    self._selector_cache[cache_key] = selector
                 logger.debug(f"Clicked with selector: {selector}")
                 return True
             except Exception as e:
@@ -2392,8 +2678,8 @@ class StockTrakBot:
     def _screenshot(self, name: str):
         """Take a screenshot for debugging"""
         try:
-            path = f'logs/{name}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.png'
-            self.page.screenshot(path=path)
+            path = f'logs/{name}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.jpg'
+            self.page.screenshot(path=path, type='jpeg', quality=60)
             logger.debug(f"Screenshot saved: {path}")
         except Exception as e:
             logger.debug(f"Screenshot failed: {e}")
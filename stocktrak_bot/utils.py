@@ -256,3 +256,43 @@ class RetryHandler:
                     logger.error(f"All {self.max_retries + 1} attempts failed")
 
         raise last_exception
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter.
+
+    Allows bursts of up to `burst` calls, refilling at `rate_per_sec`.
+    Unlike a fixed sleep after every call, time already spent doing the
+    work counts toward the wait.
+    """
+
+    def __init__(self, rate_per_sec, burst=1):
+        import time
+
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+
+    def set_rate(self, rate_per_sec):
+        """Retune the refill rate (e.g. after the broker starts pushing back)"""
+        self._refill()
+        self.rate_per_sec = rate_per_sec
+
+    def _refill(self):
+        import time
+
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate_per_sec)
+        self.last_refill = now
+
+    def acquire(self):
+        """Block until a token is available, then consume it"""
+        import time
+
+        self._refill()
+        if self.tokens < 1:
+            time.sleep((1 - self.tokens) / self.rate_per_sec)
+            self._refill()
+        self.tokens -= 1